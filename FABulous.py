@@ -98,12 +98,9 @@ def make_hex(binfile, outfile):
         logger.error("Binary file too big.")
         return
 
-    with open(outfile, "w") as f:
-        for i in range(MAX_BITBYTES):
-            if i < len(bindata):
-                print(f"{bindata[i]:02x}", file=f)
-            else:
-                print("0", file=f)
+    import fabric_cad.bit_gen as bitGen
+    with open(outfile, "wb") as f:
+        f.write(bitGen.genMemoryImage(bindata, MAX_BITBYTES))
 
 def adjust_directory_in_verilog_tb(project_dir):
     with open(f"{fabulousRoot}/fabric_files/FABulous_project_template_verilog/Test/sequential_16bit_en_tb.v", "rt") as fin:
@@ -139,7 +136,7 @@ class FABulous:
     def __init__(self, writer: codeGen.codeGenerator, fabricCSV: str = ""):
         self.writer = writer
         if fabricCSV != "":
-            self.fabric = fileParser.parseFabricCSV(fabricCSV)
+            self.fabric = fileParser.loadFabricCSV(fabricCSV)
             self.fabricGenerator = FabricGenerator(self.fabric, self.writer)
             self.geometryGenerator = GeometryGenerator(self.fabric)
 
@@ -153,7 +150,7 @@ class FABulous:
 
     def loadFabric(self, dir: str):
         if dir.endswith(".csv"):
-            self.fabric = fileParser.parseFabricCSV(dir)
+            self.fabric = fileParser.loadFabricCSV(dir)
             self.fabricGenerator = FabricGenerator(self.fabric, self.writer)
             self.geometryGenerator = GeometryGenerator(self.fabric)
         else:
@@ -333,6 +330,17 @@ To run the complete FABulous flow with the default project, run the following co
     def _complete_tileName(self, text):
         return [t for t in self.allTile if t.startswith(text)]
 
+    def _bitstreamSpecFile(self):
+        # the compiled spec is preferred, the pickled spec is the fallback for projects generated before it existed
+        specFile = f"{self.projectDir}/.FABulous/bitStreamSpec.compiled.bin"
+        if not os.path.exists(specFile):
+            specFile = f"{self.projectDir}/.FABulous/bitStreamSpec.bin"
+        if not os.path.exists(specFile):
+            logger.error(
+                "Cannot find bitStreamSpec.bin file, which is generated by running gen_bitStream_spec")
+            return None
+        return specFile
+
     def do_shell(self, args):
         "Run a shell command"
         if not args:
@@ -541,13 +549,19 @@ To run the complete FABulous flow with the default project, run the following co
         with open(f"{self.projectDir}/{metaDataDir}/bitStreamSpec.bin", "wb") as outFile:
             pickle.dump(specObject, outFile)
 
+        logger.info(
+            f"output file: {self.projectDir}/{metaDataDir}/bitStreamSpec.compiled.bin")
+        import fabric_cad.bit_gen as bitGen
+        bitGen.compileBitstreamSpec(specObject).save(
+            f"{self.projectDir}/{metaDataDir}/bitStreamSpec.compiled.bin")
+
         logger.info(
             f"output file: {self.projectDir}/{metaDataDir}/bitStreamSpec.csv")
         with open(f"{self.projectDir}/{metaDataDir}/bitStreamSpec.csv", "w") as f:
             w = csv.writer(f)
-            for key1 in specObject["TileSpecs"]:
+            for key1 in specObject["TileTypeSpecs"]:
                 w.writerow([key1])
-                for key2, val in specObject["TileSpecs"][key1].items():
+                for key2, val in specObject["TileTypeSpecs"][key1].items():
                     w.writerow([key2, val])
         logger.info("Generated bitstream specification")
 
@@ -965,9 +979,8 @@ To run the complete FABulous flow with the default project, run the following co
 
         bitstream_file = top_module_name + ".bin"
 
-        if not os.path.exists(f"{self.projectDir}/.FABulous/bitStreamSpec.bin"):
-            logger.error(
-                "Cannot find bitStreamSpec.bin file, which is generated by running gen_bitStream_spec")
+        specFile = self._bitstreamSpecFile()
+        if specFile is None:
             return
 
         if not os.path.exists(f"{self.projectDir}/{parent}/{fasm_file}"):
@@ -981,8 +994,9 @@ To run the complete FABulous flow with the default project, run the following co
         runCmd = ["python3", f"{fabulousRoot}/fabric_cad/bit_gen.py",
                   "-genBitstream",
                   f"{self.projectDir}/{parent}/{fasm_file}",
-                  f"{self.projectDir}/.FABulous/bitStreamSpec.bin",
-                  f"{self.projectDir}/{parent}/{bitstream_file}"]
+                  specFile,
+                  f"{self.projectDir}/{parent}/{bitstream_file}",
+                  "-hex", str(MAX_BITBYTES)]
 
         try:
             sp.run(runCmd, check=True)
@@ -996,6 +1010,156 @@ To run the complete FABulous flow with the default project, run the following co
     def complete_gen_bitStream_binary(self, text, *ignored):
         return self._complete_path(text)
 
+    def do_gen_bitStream_batch(self, args):
+        "Generate the bitstreams of all fasm files matching a glob pattern in one process pool. Need to generate bitstream specification before use. Usage: gen_bitStream_batch <fasm_glob> [processes]"
+        args = self.parse(args)
+        if len(args) not in [1, 2]:
+            logger.error("Usage: gen_bitStream_batch <fasm_glob> [processes]")
+            return
+
+        processes = None
+        if len(args) == 2:
+            try:
+                processes = int(args[1])
+            except ValueError:
+                logger.error("Usage: gen_bitStream_batch <fasm_glob> [processes]")
+                return
+
+        specFile = self._bitstreamSpecFile()
+        if specFile is None:
+            return
+
+        fasmFiles = sorted(f for f in glob(f"{self.projectDir}/{args[0]}") if f.endswith(".fasm"))
+        if not fasmFiles:
+            logger.error(f"No fasm file matches {self.projectDir}/{args[0]}")
+            return
+
+        logger.info(f"Generating {len(fasmFiles)} bitstreams")
+        failed = []
+        import fabric_cad.bit_gen as bitGen
+        results = bitGen.genBitstreamBatch(fasmFiles, specFile, processes)
+        for done, (fasmFile, bitstreamFile, error, seconds) in enumerate(results, 1):
+            if error:
+                failed.append(fasmFile)
+                logger.error(f"[{done}/{len(fasmFiles)}] Bitstream generation failed for {fasmFile}\n{error}")
+            else:
+                logger.info(f"[{done}/{len(fasmFiles)}] Generated {bitstreamFile} in {seconds:.2f}s")
+
+        if failed:
+            logger.error(f"Bitstream generation failed for {len(failed)} of {len(fasmFiles)} designs: {' '.join(failed)}")
+            raise BitstreamGenerationError
+
+        logger.info("Bitstreams generated")
+
+    def complete_gen_bitStream_batch(self, text, *ignored):
+        return self._complete_path(text)
+
+    def do_gen_bitStream_partial(self, args):
+        "Generate a partial bitstream holding only the frames that differ from a base bitstream or fasm file. Need to generate bitstream specification before use. Usage: gen_bitStream_partial <base_bitstream_or_fasm_file> <fasm_file>"
+        args = self.parse(args)
+        if len(args) != 2:
+            logger.error("Usage: gen_bitStream_partial <base_bitstream_or_fasm_file> <fasm_file>")
+            return
+        basePath = get_path(args[0])
+        path = get_path(args[1])
+        if path.suffix != ".fasm" or basePath.suffix not in [".bin", ".fasm"]:
+            logger.error("Usage: gen_bitStream_partial <base_bitstream_or_fasm_file> <fasm_file>")
+            return
+        bitstreamPath = path.with_name(f"{path.stem}_partial.bin")
+
+        specFile = self._bitstreamSpecFile()
+        if specFile is None:
+            return
+
+        for i in [basePath, path]:
+            if not os.path.exists(f"{self.projectDir}/{i}"):
+                logger.error(f"Cannot find {self.projectDir}/{i}")
+                return
+
+        logger.info(f"Generating partial bitstream of {self.projectDir}/{path} against {self.projectDir}/{basePath}")
+        import fabric_cad.bit_gen as bitGen
+        try:
+            written, total = bitGen.genPartialBitstream(f"{self.projectDir}/{basePath}", f"{self.projectDir}/{path}",
+                                                        specFile, f"{self.projectDir}/{bitstreamPath}")
+        except Exception as e:
+            logger.error(f"Partial bitstream generation failed: {e}")
+            raise BitstreamGenerationError
+
+        logger.info(f"Partial bitstream {self.projectDir}/{bitstreamPath} holds {written} of {total} frames")
+
+    def complete_gen_bitStream_partial(self, text, *ignored):
+        return self._complete_path(text)
+
+    def do_gen_bitStream_report(self, args):
+        "Report the set bit density, frame usage and configuration time estimate of a bitstream or fasm file. Need to generate bitstream specification before use. Usage: gen_bitStream_report <bitstream_or_fasm_file> [clock_MHz] [base_bitstream_or_fasm_file]"
+        args = self.parse(args)
+        if len(args) not in [1, 2, 3]:
+            logger.error("Usage: gen_bitStream_report <bitstream_or_fasm_file> [clock_MHz] [base_bitstream_or_fasm_file]")
+            return
+        path = get_path(args[0])
+        clockFrequency = 25e6
+        if len(args) >= 2:
+            try:
+                clockFrequency = float(args[1]) * 1e6
+            except ValueError:
+                logger.error("Usage: gen_bitStream_report <bitstream_or_fasm_file> [clock_MHz] [base_bitstream_or_fasm_file]")
+                return
+        basePath = get_path(args[2]) if len(args) == 3 else None
+        reportPath = path.with_name(f"{path.stem}_report.txt")
+
+        specFile = self._bitstreamSpecFile()
+        if specFile is None:
+            return
+
+        for i in [path, basePath]:
+            if i is not None and not os.path.exists(f"{self.projectDir}/{i}"):
+                logger.error(f"Cannot find {self.projectDir}/{i}")
+                return
+
+        import fabric_cad.bit_gen as bitGen
+        stats = bitGen.genBitstreamReportFile(f"{self.projectDir}/{path}", specFile, f"{self.projectDir}/{reportPath}",
+                                              clockFrequency, baseFile=f"{self.projectDir}/{basePath}" if basePath else None)
+        logger.info(f"{stats['setBits']} of {stats['configBits']} configuration bits set, "
+                    f"{stats['nonEmptyFrames']} of {stats['frames']} frames non-empty")
+        logger.info(f"Report written to {self.projectDir}/{reportPath}")
+
+    def complete_gen_bitStream_report(self, text, *ignored):
+        return self._complete_path(text)
+
+    def do_decode_bitStream(self, args):
+        "Decode a bitstream back into the fasm features it configures. Need to generate bitstream specification before use. Usage: decode_bitStream <bitstream_file> [fasm_file]"
+        args = self.parse(args)
+        if len(args) not in [1, 2]:
+            logger.error("Usage: decode_bitStream <bitstream_file> [fasm_file]")
+            return
+        path = get_path(args[0])
+        if path.suffix != ".bin":
+            logger.error("Usage: decode_bitStream <bitstream_file> [fasm_file]")
+            return
+        fasmPath = get_path(args[1]) if len(args) == 2 else path.with_name(f"{path.stem}_decoded.fasm")
+
+        specFile = self._bitstreamSpecFile()
+        if specFile is None:
+            return
+
+        if not os.path.exists(f"{self.projectDir}/{path}"):
+            logger.error(f"Cannot find {self.projectDir}/{path}")
+            return
+
+        logger.info(f"Decoding bitstream {self.projectDir}/{path}")
+        import fabric_cad.bit_gen as bitGen
+        try:
+            features, unexplained = bitGen.decodeBitstream(f"{self.projectDir}/{path}", specFile, f"{self.projectDir}/{fasmPath}")
+        except ValueError as e:
+            logger.error(f"Bitstream decoding failed: {e}")
+            return
+        if unexplained:
+            logger.warning(f"{len(unexplained)} set bits are not part of any feature in the bitstream spec")
+        logger.info(f"Decoded {len(features)} features to {self.projectDir}/{fasmPath}")
+
+    def complete_decode_bitStream(self, text, *ignored):
+        return self._complete_path(text)
+
     def do_run_simulation(self, args):
         """
         Simulate the given design. Need to generate the bitstream before use.
@@ -1076,6 +1240,7 @@ To run the complete FABulous flow with the default project, run the following co
             remove_dir(f"{self.projectDir}/{path}/tmp")
             return
 
+        # the hex image is rebuilt from the bitstream every time, so it always has the current size and layout
         make_hex(f"{self.projectDir}/{path}/{bitstream}", f"{self.projectDir}/{path}/{bitstream_hex}")
 
         try:
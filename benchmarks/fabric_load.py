@@ -0,0 +1,64 @@
+"""
+Micro-benchmark of loading a fabric: times `parseFabricCSV` and `Fabric.__post_init__` on synthetic fabrics built by
+repeating the inner rows and columns of a project's fabric.csv.
+
+    python3 benchmarks/fabric_load.py [-project <dir>] [-size 100 100] [-repeat 3] [-processes 1]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fabric_generator.file_parser import parseFabricCSV  # noqa: E402
+from tests.performance.synth import synthFabricCSV  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parseFabricCSV and Fabric.__post_init__")
+    parser.add_argument("-project", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                                                         "fabric_files", "FABulous_project_template_verilog"),
+                        help="The project whose fabric.csv is grown")
+    parser.add_argument("-size", nargs=2, type=int, default=[100, 100], metavar=("ROWS", "COLUMNS"),
+                        help="The size of the synthetic fabric")
+    parser.add_argument("-repeat", type=int, default=3, help="The number of timed runs")
+    parser.add_argument("-processes", type=int, default=1,
+                        help="The number of processes parsing the bel and matrix files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # a copy without .FABulous so that the bel cache is not used
+        project = os.path.join(tmp, "project")
+        shutil.copytree(args.project, project, ignore=shutil.ignore_patterns(".FABulous"))
+        rows, columns = args.size
+        fileName = os.path.join(project, f"fabric_{rows}x{columns}.csv")
+        synthFabricCSV(os.path.join(project, "fabric.csv"), fileName, rows, columns)
+
+        parseTimes, postInitTimes = [], []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fabric = parseFabricCSV(fileName, args.processes)
+            parseTimes.append(time.perf_counter() - start)
+
+            # run __post_init__ again on the parsed fabric from scratch
+            fabric.commonWirePair = []
+            for row in fabric.tile:
+                for tile in row:
+                    if tile is not None:
+                        tile.wireList = []
+            start = time.perf_counter()
+            fabric.__post_init__()
+            postInitTimes.append(time.perf_counter() - start)
+
+        wires = sum(len(tile.wireList) for row in fabric.tile for tile in row if tile is not None)
+        print(f"fabric {fabric.numberOfRows}x{fabric.numberOfColumns}, {len(fabric.tileDic)} tile types, "
+              f"{len(fabric.commonWirePair)} common wire pairs, {wires} placed wires")
+        print(f"parseFabricCSV: best {min(parseTimes):.3f}s of {args.repeat}")
+        print(f"__post_init__:  best {min(postInitTimes):.3f}s of {args.repeat}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,13 @@ import os
 import numpy
 import pickle
 import csv
-from fasm import * #Remove this line if you do not have the fasm library installed and will not be generating a bitstream
+import json
+import time
+import traceback
+
+# the fabric_generator package is next to this script when it is run directly
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fabric_generator.utilities import processPoolContext
     
 def replace(string, substitutions):
     substrings = sorted(substitutions, key=len, reverse=True)
@@ -21,9 +27,28 @@ def bitstring_to_bytes(s):
 
 #CAD methods from summer vacation project 2020
 
+#Side outputs written next to the .bin file, for inspection (.csv) and for emulating the configured fabric (.vh, .vhd)
+SIDE_OUTPUTS = ("csv", "vh", "vhd")
+
+def sideOutputFile(bitstreamFile: str, ext: str) -> str:
+    #The side output of the bitstream file with its extension replaced by ext, even if bin appears elsewhere in the path
+    return os.path.splitext(bitstreamFile)[0] + "." + ext
 
 #Method to generate bitstream in the output format - more detail at the end
-def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str):
+def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str, engine: str = "numpy", imageSize: int = None,
+                 processes: int = 1, outputs = SIDE_OUTPUTS):
+    #If imageSize is given, .hex and .mem memory images of the bitstream padded to imageSize bytes are written as well.
+    #processes other than 1 generates the columns of the numpy engine in parallel, None uses all cores.
+    #outputs selects the side outputs that are written, an empty tuple only writes the .bin file.
+    if engine == "numpy":
+        return genBitstreamNumpy(fasmFile, specFile, bitstreamFile, imageSize, processes, outputs)
+    elif engine != "legacy":
+        raise ValueError(f"Unknown bitstream engine {engine}, valid options are numpy and legacy")
+    if isCompiledSpec(specFile):
+        raise ValueError("The legacy bitstream engine only supports the pickled bitstream spec")
+    #Only the legacy engine uses the fasm library, the numpy engine parses the fasm file itself
+    from fasm import parse_fasm_filename, fasm_tuple_to_string, parse_fasm_string, set_feature_to_str
+
     lGen = parse_fasm_filename(fasmFile)
     canonStr = fasm_tuple_to_string(lGen, True)
     canonList = list(parse_fasm_string(canonStr))
@@ -32,6 +57,14 @@ def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str):
     tileDict = {}
     tileDict_No_Mask = {}
 
+    #Resolve the feature maps of each tile location through its tile type template
+    if "TileTypeSpecs" in specDict:
+        specDict["TileSpecs"] = {}
+        specDict["TileSpecs_No_Mask"] = {}
+        for tileLoc in specDict["TileMap"]:
+            if tileSpec := tileSpecOf(specDict, tileLoc):
+                specDict["TileSpecs"][tileLoc], specDict["TileSpecs_No_Mask"][tileLoc] = tileSpec
+
     FrameBitsPerRow = specDict["ArchSpecs"]["FrameBitsPerRow"]
     MaxFramesPerCol = specDict["ArchSpecs"]["MaxFramesPerCol"]
 
@@ -51,7 +84,7 @@ def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str):
             tileLoc = tileVals[0]
             featureName = ".".join((tileVals[1], tileVals[2]))
             if tileLoc not in specDict["TileMap"].keys():
-                raise Exception("Tile found in fasm file not found in bitstream spec")
+                raise Exception(f"Tile {tileLoc} of feature {featureName} found in fasm file not found in bitstream spec")
             tileType = specDict["TileMap"][tileLoc] #Set the necessary bits high 
             if featureName in specDict["TileSpecs"][tileLoc].keys():
                 if specDict["TileSpecs"][tileLoc][featureName]:
@@ -61,11 +94,7 @@ def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str):
                         tileDict_No_Mask[tileLoc][bitIndex_No_Mask] = int(specDict["TileSpecs_No_Mask"][tileLoc][featureName][bitIndex_No_Mask])
 
             else:
-                #print(specDict["TileSpecs"][tileLoc].keys())
-                print(tileType)
-                print(tileLoc)
-                print(featureName)
-                raise Exception("Feature found in fasm file was not found in the bitstream spec")
+                raise Exception(f"Feature {featureName} of tile {tileLoc} ({tileType}) found in fasm file was not found in the bitstream spec")
 
 
     #Write output string and introduce mask
@@ -79,7 +108,9 @@ def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str):
         num_rows = max(int(coordsMatch.group(2))+1,num_rows)
     outStr = ""
     bitStr = bytes.fromhex('00AAFF01000000010000000000000000FAB0FAB1')
-    bit_array = [[b'' for x in range(20)] for y in range(num_columns)]
+    checkFrameGeometry(num_rows, num_columns, specDict["ArchSpecs"])
+    FrameSelectWidth = specDict["ArchSpecs"].get("FrameSelectWidth", 5)
+    bit_array = [[b'' for x in range(MaxFramesPerCol)] for y in range(num_columns)]
 
     verilog_str = ''
     vhdl_str = 'library IEEE;\nuse IEEE.STD_LOGIC_1164.ALL;\n\npackage emulate_bitstream is\n'
@@ -125,17 +156,9 @@ def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str):
 
     #print(num_columns)
     for i in range(num_columns):
-        for j in range(20):
-            bin_temp = f"{i:05b}"[::-1]
-            frame_select = ['0' for k in range(32)]
-            #bitStr += "X"+str(i)+", frame"+str(j)+"\n"
-
-            for k in range(-5,0,1):
-                frame_select[k] = bin_temp[k]
-            frame_select[j] = '1'
-            frame_select_temp = (''.join(frame_select))[::-1]
-
-            bitStr += bitstring_to_bytes(frame_select_temp)
+        for j in range(MaxFramesPerCol):
+            frame_select = frameSelectWord(i, j, FrameBitsPerRow, FrameSelectWidth)
+            bitStr += frame_select.to_bytes((FrameBitsPerRow + 7) // 8, byteorder='big')
             bitStr += bit_array[i][j]
 
                         
@@ -143,13 +166,1053 @@ def genBitstream(fasmFile: str, specFile: str, bitstreamFile: str):
     #Tile Loc, Tile Type, X, Y, bits...... \n 
     #Each line is one tile
     # Write out bitstream CSV representation
-    print(outStr, file = open(bitstreamFile.replace("bin","csv"), "w+"))
+    if "csv" in outputs:
+        print(outStr, file = open(sideOutputFile(bitstreamFile, "csv"), "w+"))
     # Write out HDL representations
-    print(verilog_str, file = open(bitstreamFile.replace("bin","vh"), "w+"))
-    print(vhdl_str, file = open(bitstreamFile.replace("bin","vhd"), "w+"))
+    if "vh" in outputs:
+        print(verilog_str, file = open(sideOutputFile(bitstreamFile, "vh"), "w+"))
+    if "vhd" in outputs:
+        print(vhdl_str, file = open(sideOutputFile(bitstreamFile, "vhd"), "w+"))
     # Write out binary representation
     with open(bitstreamFile, 'bw+') as f:
      f.write(bitStr)
+    if imageSize is not None:
+        writeMemoryImages(bitStr, bitstreamFile, imageSize, (FrameBitsPerRow + 7) // 8)
+
+
+#Compiled bitstream spec
+#The pickled spec is a nested dict keyed by strings like "X3Y5" and "A.INIT[3]". The compiled spec holds the same
+#information as flat arrays: an interned feature name table, one feature table per tile template (feature -> bit
+#indices and values, sorted by feature name index) and a tile location -> template table. The arrays are stored
+#in a single file behind a small JSON header and are memory-mapped on load.
+
+COMPILED_SPEC_MAGIC = b"FABSPEC\x01"
+COMPILED_SPEC_ALIGNMENT = 64
+
+
+def parseTileLoc(tileLoc: str):
+    coordsMatch = re.match(r"X(\d+)Y(\d+)$", tileLoc)
+    if not coordsMatch:
+        raise ValueError(f"Invalid tile location {tileLoc} in bitstream spec")
+    return int(coordsMatch.group(1)), int(coordsMatch.group(2))
+
+
+class BitstreamSpec:
+    arrayNames = ["nameOffsets", "nameData", "tileTemplate", "templateType", "templateFeaturePtr",
+                  "featureName", "featureBitPtr", "featureBitIndex", "featureBitValue",
+                  "featureNoMaskBitPtr", "featureNoMaskBitIndex", "featureNoMaskBitValue",
+                  "typeFrameMask", "typeHasFrameMap", "typeConfigBitPtr", "typeConfigBitFrameBit"]
+
+    def __init__(self, archSpecs: dict, tileTypes, arrays: dict):
+        self.archSpecs = archSpecs
+        self.FrameBitsPerRow = archSpecs["FrameBitsPerRow"]
+        self.MaxFramesPerCol = archSpecs["MaxFramesPerCol"]
+        self.FrameSelectWidth = archSpecs.get("FrameSelectWidth", 5)
+        self.RowSelectWidth = archSpecs.get("RowSelectWidth", 5)
+        self.DesyncFlag = archSpecs.get("DesyncFlag", 20)
+        self.tileTypes = list(tileTypes)
+        #Specs compiled before the config bit encoding was added do not hold it
+        if "typeConfigBitPtr" not in arrays:
+            arrays = dict(arrays, typeConfigBitPtr=numpy.zeros(len(self.tileTypes)+1, dtype=numpy.int64),
+                          typeConfigBitFrameBit=numpy.zeros(0, dtype=numpy.int32))
+        for name in self.arrayNames:
+            setattr(self, name, arrays[name])
+        self.num_rows, self.num_columns = self.tileTemplate.shape
+
+        nameData = bytes(self.nameData).decode()
+        nameOffsets = self.nameOffsets.tolist()
+        self.featureNames = [nameData[nameOffsets[i]:nameOffsets[i+1]] for i in range(len(nameOffsets)-1)]
+        #Position of each feature name in sorted order, the canonical FASM order that decides which feature wins a bit
+        self.nameRank = numpy.empty(len(self.featureNames), dtype=numpy.int64)
+        self.nameRank[sorted(range(len(self.featureNames)), key=self.featureNames.__getitem__)] = numpy.arange(len(self.featureNames))
+        self.templatePtr = self.templateFeaturePtr.tolist()
+        self.locCache = {}
+        self.featureIndexCache = {}
+        self.templateFeatures = {}
+        self.targets = None
+
+    def tileType(self, x: int, y: int) -> str:
+        template = self.tileTemplate[y, x]
+        if template < 0:
+            return "NULL"
+        return self.tileTypes[self.templateType[template]]
+
+    def tileTypeIndex(self, x: int, y: int) -> int:
+        template = self.tileTemplate[y, x]
+        if template < 0:
+            return -1
+        return int(self.templateType[template])
+
+    def hasFrameMap(self, x: int, y: int) -> bool:
+        typeIndex = self.tileTypeIndex(x, y)
+        return typeIndex >= 0 and bool(self.typeHasFrameMap[typeIndex])
+
+    def tileLocs(self):
+        #Same order as the TileMap of the pickled spec
+        for y in range(self.num_rows):
+            for x in range(self.num_columns):
+                yield f"X{x}Y{y}", x, y
+
+    def resolveTile(self, tileLoc: str):
+        #Returns (x, y, template) of a tile location, template is -1 for NULL tiles
+        if tileLoc not in self.locCache:
+            try:
+                x, y = parseTileLoc(tileLoc)
+            except ValueError:
+                raise Exception(f"Tile {tileLoc} found in fasm file not found in bitstream spec")
+            if x >= self.num_columns or y >= self.num_rows:
+                raise Exception(f"Tile {tileLoc} found in fasm file not found in bitstream spec")
+            self.locCache[tileLoc] = (x, y, int(self.tileTemplate[y, x]))
+        return self.locCache[tileLoc]
+
+    def findFeature(self, template: int, featureName: str) -> int:
+        #Returns the feature entry of featureName in the template, or -1 if the template has no such feature
+        if template < 0:
+            return -1
+        if template not in self.templateFeatures:
+            low, high = self.templatePtr[template], self.templatePtr[template+1]
+            self.templateFeatures[template] = {self.featureNames[nameIndex]: low + i
+                                               for i, nameIndex in enumerate(self.featureName[low:high].tolist())}
+        return self.templateFeatures[template].get(featureName, -1)
+
+    def configBitFrameBits(self, typeIndex: int):
+        #Frame bit of each ConfigBits bit of the tile type's ConfigMem, -1 for unmapped bits, empty if unknown
+        return self.typeConfigBitFrameBit[self.typeConfigBitPtr[typeIndex]:self.typeConfigBitPtr[typeIndex+1]]
+
+    def featureBits(self, entry: int):
+        low, high = self.featureBitPtr[entry], self.featureBitPtr[entry+1]
+        return self.featureBitIndex[low:high], self.featureBitValue[low:high]
+
+    def featureNoMaskBits(self, entry: int):
+        low, high = self.featureNoMaskBitPtr[entry], self.featureNoMaskBitPtr[entry+1]
+        return self.featureNoMaskBitIndex[low:high], self.featureNoMaskBitValue[low:high]
+
+    def featureTargets(self):
+        #Joins the masked and unmasked bits of each feature into one table of (targetPtr, targetIndex, targetValue).
+        #Target indices address a tile's masked bits followed by its unmasked bits, negative bit indices are wrapped
+        #and features without masked bits set nothing, like the list based engine.
+        if self.targets is None:
+            tileBits = self.MaxFramesPerCol * self.FrameBitsPerRow
+            maskPtr = self.featureBitPtr.astype(numpy.int64)
+            noMaskPtr = self.featureNoMaskBitPtr.astype(numpy.int64)
+            maskCounts = numpy.diff(maskPtr)
+            noMaskCounts = numpy.where(maskCounts > 0, numpy.diff(noMaskPtr), 0)
+            targetPtr = numpy.concatenate(([0], numpy.cumsum(maskCounts + noMaskCounts)))
+            targetIndex = numpy.empty(targetPtr[-1], dtype=numpy.int64)
+            targetValue = numpy.empty(targetPtr[-1], dtype=numpy.uint8)
+
+            entries = numpy.repeat(numpy.arange(len(maskCounts)), maskCounts)
+            offsets = numpy.arange(len(entries)) - maskPtr[entries]
+            targetIndex[targetPtr[entries] + offsets] = numpy.mod(self.featureBitIndex, tileBits)
+            targetValue[targetPtr[entries] + offsets] = self.featureBitValue
+
+            entries = numpy.repeat(numpy.arange(len(noMaskCounts)), noMaskCounts)
+            offsets = numpy.arange(len(entries)) - (numpy.cumsum(noMaskCounts) - noMaskCounts)[entries]
+            noMaskBits = noMaskPtr[entries] + offsets
+            targetIndex[targetPtr[entries] + maskCounts[entries] + offsets] = tileBits + numpy.mod(self.featureNoMaskBitIndex[noMaskBits], tileBits)
+            targetValue[targetPtr[entries] + maskCounts[entries] + offsets] = self.featureNoMaskBitValue[noMaskBits]
+            self.targets = (targetPtr, targetIndex, targetValue)
+        return self.targets
+
+    def featureIndex(self, template: int):
+        #Inverted index of a template, maps the first bit a feature sets to 1 onto (entry, bitIndex, values) of the
+        #features anchored there. Features that set no bit to 1 cannot be told apart from an unused tile and are left out.
+        if template not in self.featureIndexCache:
+            tileBits = self.MaxFramesPerCol * self.FrameBitsPerRow
+            index = {}
+            for entry in range(self.templatePtr[template], self.templatePtr[template+1]):
+                bitIndex, values = self.featureBits(entry)
+                featureBits = dict(zip((int(i) % tileBits for i in bitIndex), values.tolist()))
+                setBits = [i for i, value in featureBits.items() if value]
+                if not setBits:
+                    continue
+                index.setdefault(min(setBits), []).append((entry, numpy.array(list(featureBits.keys())),
+                                                           numpy.array(list(featureBits.values()), dtype=numpy.uint8)))
+            self.featureIndexCache[template] = index
+        return self.featureIndexCache[template]
+
+    def save(self, specFile: str):
+        arrays = [(name, numpy.ascontiguousarray(getattr(self, name))) for name in self.arrayNames]
+        header = {"ArchSpecs": self.archSpecs, "TileTypes": self.tileTypes, "Arrays": {}}
+        offset = 0
+        for name, values in arrays:
+            header["Arrays"][name] = {"dtype": values.dtype.str, "shape": list(values.shape), "offset": offset}
+            offset += -(-values.nbytes // COMPILED_SPEC_ALIGNMENT) * COMPILED_SPEC_ALIGNMENT
+        headerBytes = json.dumps(header).encode()
+        dataStart = -(-(len(COMPILED_SPEC_MAGIC) + 8 + len(headerBytes)) // COMPILED_SPEC_ALIGNMENT) * COMPILED_SPEC_ALIGNMENT
+
+        with open(specFile, "wb") as f:
+            f.write(COMPILED_SPEC_MAGIC)
+            f.write(len(headerBytes).to_bytes(8, byteorder='little'))
+            f.write(headerBytes)
+            for name, values in arrays:
+                f.seek(dataStart + header["Arrays"][name]["offset"])
+                f.write(values.tobytes())
+            f.truncate(dataStart + offset)
+
+
+def isCompiledSpec(specFile: str) -> bool:
+    with open(specFile, "rb") as f:
+        return f.read(len(COMPILED_SPEC_MAGIC)) == COMPILED_SPEC_MAGIC
+
+
+def loadCompiledSpec(specFile: str) -> BitstreamSpec:
+    with open(specFile, "rb") as f:
+        if f.read(len(COMPILED_SPEC_MAGIC)) != COMPILED_SPEC_MAGIC:
+            raise ValueError(f"{specFile} is not a compiled bitstream spec")
+        headerLength = int.from_bytes(f.read(8), byteorder='little')
+        header = json.loads(f.read(headerLength).decode())
+    dataStart = -(-(len(COMPILED_SPEC_MAGIC) + 8 + headerLength) // COMPILED_SPEC_ALIGNMENT) * COMPILED_SPEC_ALIGNMENT
+
+    arrays = {}
+    for name, info in header["Arrays"].items():
+        shape = tuple(info["shape"])
+        if math.prod(shape) == 0:
+            arrays[name] = numpy.zeros(shape, dtype=info["dtype"])
+        else:
+            arrays[name] = numpy.memmap(specFile, dtype=info["dtype"], mode="r",
+                                        offset=dataStart + info["offset"], shape=shape)
+    return BitstreamSpec(header["ArchSpecs"], header["TileTypes"], arrays)
+
+
+def tileSpecOf(specDict: dict, tileLoc: str):
+    #Returns the (masked, unmasked) feature maps of a tile location, resolved through the tile type template of the
+    #spec. Specs written before the templates were introduced map each location to its own feature maps.
+    tileType = specDict["TileMap"].get(tileLoc, "NULL")
+    if "TileTypeSpecs" in specDict:
+        if tileType not in specDict["TileTypeSpecs"]:
+            return None
+        return specDict["TileTypeSpecs"][tileType], specDict["TileTypeSpecs_No_Mask"][tileType]
+    if tileType == "NULL" or tileLoc not in specDict["TileSpecs"]:
+        return None
+    return specDict["TileSpecs"][tileLoc], specDict["TileSpecs_No_Mask"][tileLoc]
+
+
+def compileBitstreamSpec(specDict: dict) -> BitstreamSpec:
+    FrameBitsPerRow = specDict["ArchSpecs"]["FrameBitsPerRow"]
+    MaxFramesPerCol = specDict["ArchSpecs"]["MaxFramesPerCol"]
+
+    num_columns = 0
+    num_rows = 0
+    for tileKey in specDict["TileMap"]:
+        x, y = parseTileLoc(tileKey)
+        num_columns = max(x+1, num_columns)
+        num_rows = max(y+1, num_rows)
+
+    tileTypes = [t for t in specDict["FrameMap"]]
+    for tileType in specDict["TileMap"].values():
+        if tileType != "NULL" and tileType not in tileTypes:
+            tileTypes.append(tileType)
+    typeIndex = {t: i for i, t in enumerate(tileTypes)}
+
+    typeFrameMask = numpy.zeros((len(tileTypes), MaxFramesPerCol*FrameBitsPerRow), dtype=numpy.uint8)
+    typeHasFrameMap = numpy.zeros(len(tileTypes), dtype=numpy.uint8)
+    for tileType, maskDic in specDict["FrameMap"].items():
+        typeHasFrameMap[typeIndex[tileType]] = len(maskDic) > 0
+        for frameIndex, mask in maskDic.items():
+            for i, char in enumerate(mask):
+                if char == "1":
+                    typeFrameMask[typeIndex[tileType], FrameBitsPerRow*frameIndex + FrameBitsPerRow-1-i] = 1
+
+    #Encoding of the ConfigBits of each tile type's ConfigMem into its frame bits, as far as the spec holds it
+    typeConfigBitPtr = [0]
+    typeConfigBitFrameBit = []
+    for tileType in tileTypes:
+        typeConfigBitFrameBit.extend(specDict.get("FrameMapEncode", {}).get(tileType) or [])
+        typeConfigBitPtr.append(len(typeConfigBitFrameBit))
+
+    #Tiles of the same type share one template as long as their feature maps are identical, which is always the
+    #case for specs holding tile type templates
+    nameIndex = {}
+    templates = []
+    templateType = []
+    templatesByType = {}
+    tileTemplate = numpy.full((num_rows, num_columns), -1, dtype=numpy.int32)
+    for tileKey, tileType in specDict["TileMap"].items():
+        content = tileSpecOf(specDict, tileKey)
+        if content is None:
+            continue
+        x, y = parseTileLoc(tileKey)
+        for template in templatesByType.setdefault(tileType, []):
+            if templates[template] == content:
+                break
+        else:
+            template = len(templates)
+            templates.append(content)
+            templateType.append(typeIndex[tileType])
+            templatesByType[tileType].append(template)
+        tileTemplate[y, x] = template
+        for featureName in content[0]:
+            nameIndex.setdefault(featureName, len(nameIndex))
+
+    templateFeaturePtr = [0]
+    featureName = []
+    featureBitPtr, featureBitIndex, featureBitValue = [0], [], []
+    featureNoMaskBitPtr, featureNoMaskBitIndex, featureNoMaskBitValue = [0], [], []
+    for tileSpec, tileSpecNoMask in templates:
+        for name in sorted(tileSpec, key=nameIndex.get):
+            featureName.append(nameIndex[name])
+            for bitIndex, value in tileSpec[name].items():
+                featureBitIndex.append(bitIndex)
+                featureBitValue.append(int(value))
+            featureBitPtr.append(len(featureBitIndex))
+            for bitIndex, value in tileSpecNoMask.get(name, {}).items():
+                featureNoMaskBitIndex.append(bitIndex)
+                featureNoMaskBitValue.append(int(value))
+            featureNoMaskBitPtr.append(len(featureNoMaskBitIndex))
+        templateFeaturePtr.append(len(featureName))
+
+    names = [n.encode() for n in nameIndex]
+    arrays = {
+        "nameOffsets": numpy.cumsum([0] + [len(n) for n in names], dtype=numpy.int64),
+        "nameData": numpy.frombuffer(b"".join(names), dtype=numpy.uint8),
+        "tileTemplate": tileTemplate,
+        "templateType": numpy.array(templateType, dtype=numpy.int32),
+        "templateFeaturePtr": numpy.array(templateFeaturePtr, dtype=numpy.int64),
+        "featureName": numpy.array(featureName, dtype=numpy.int32),
+        "featureBitPtr": numpy.array(featureBitPtr, dtype=numpy.int64),
+        "featureBitIndex": numpy.array(featureBitIndex, dtype=numpy.int32),
+        "featureBitValue": numpy.array(featureBitValue, dtype=numpy.uint8),
+        "featureNoMaskBitPtr": numpy.array(featureNoMaskBitPtr, dtype=numpy.int64),
+        "featureNoMaskBitIndex": numpy.array(featureNoMaskBitIndex, dtype=numpy.int32),
+        "featureNoMaskBitValue": numpy.array(featureNoMaskBitValue, dtype=numpy.uint8),
+        "typeFrameMask": typeFrameMask,
+        "typeHasFrameMap": typeHasFrameMap,
+        "typeConfigBitPtr": numpy.array(typeConfigBitPtr, dtype=numpy.int64),
+        "typeConfigBitFrameBit": numpy.array(typeConfigBitFrameBit, dtype=numpy.int32),
+    }
+    return BitstreamSpec(dict(specDict["ArchSpecs"]), tileTypes, arrays)
+
+
+def loadBitstreamSpec(specFile: str) -> BitstreamSpec:
+    #Accepts both the compiled and the pickled spec format
+    if isCompiledSpec(specFile):
+        return loadCompiledSpec(specFile)
+    return compileBitstreamSpec(pickle.load(open(specFile, "rb")))
+
+
+#NumPy bit-plane engine
+#The whole device is kept as one uint8 array shaped (rows, columns, MaxFramesPerCol*FrameBitsPerRow) with one
+#element per configuration bit, which can be viewed as (rows, columns, frames, bits). Tile bit i of frame f is
+#element f*FrameBitsPerRow + i, the same indexing as the per tile lists of the legacy engine.
+
+#Streaming FASM reader
+#Reads the FASM file line by line and yields the features of its canonical form as (tileLoc, featureName, value)
+#tuples, without building the canonical string in memory. Multi-bit features are split into one feature per set bit,
+#named without the address for bit 0, and cleared bits are dropped, as fasm_tuple_to_string(..., canonical=True) does.
+
+fasmLineRE = re.compile(r"""
+    ^\s*(?P<feature>[A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*)
+    \s*(?:\[\s*(?P<end>\d+)\s*(?::\s*(?P<start>\d+)\s*)?\])?
+    \s*(?:=\s*(?P<value>[0-9]*'?[bBhHoOdD]?[0-9a-fA-F_xXzZ]+))?
+    \s*(?:\{.*\})?
+    \s*(?:\#.*)?$""", re.VERBOSE)
+fasmValueRE = re.compile(r"(?:(\d+)?'([bBhHoOdD]))?([0-9a-fA-F_]+)$")
+fasmValueBases = {"b": 2, "o": 8, "d": 10, "h": 16}
+
+
+def parseFasmValue(valueStr: str, lineNumber: int) -> int:
+    valueMatch = fasmValueRE.match(valueStr)
+    if not valueMatch:
+        raise ValueError(f"Invalid value {valueStr} in line {lineNumber} of the fasm file")
+    width, base, digits = valueMatch.groups()
+    value = int(digits.replace("_", ""), fasmValueBases[base.lower()] if base else 10)
+    if width is not None and value >= 1 << int(width):
+        raise ValueError(f"Value {valueStr} in line {lineNumber} of the fasm file does not fit in {width} bits")
+    return value
+
+
+def readFasmFeatures(fasmFile: str, startOffset: int = 0, endOffset: int = None, firstLine: int = 1):
+    #startOffset and endOffset select a part of the file by byte offsets at line starts, firstLine is the number of
+    #its first line
+    if endOffset is None:
+        with open(fasmFile) as f:
+            yield from parseFasmLines(f, fasmFile, firstLine)
+    else:
+        with open(fasmFile, "rb") as f:
+            f.seek(startOffset)
+            lines = f.read(endOffset - startOffset).decode().split("\n")
+        yield from parseFasmLines(lines, fasmFile, firstLine)
+
+
+def parseFasmLines(lines, fasmFile: str, firstLine: int = 1):
+    for lineNumber, line in enumerate(lines, firstLine):
+        line = line.strip()
+        if not line or line[0] in "#{":
+            continue
+        lineMatch = fasmLineRE.match(line)
+        if not lineMatch:
+            raise ValueError(f"Invalid line {lineNumber} in fasm file {fasmFile}: {line}")
+        feature, end, start, valueStr = lineMatch.group("feature", "end", "start", "value")
+        value = 1 if valueStr is None else parseFasmValue(valueStr, lineNumber)
+        if value == 0:
+            continue
+        if end is None:
+            start = end = 0
+        else:
+            end = int(end)
+            start = end if start is None else int(start)
+            if start > end:
+                raise ValueError(f"Invalid address range in line {lineNumber} of the fasm file: {line}")
+        if value >= 1 << (end - start + 1):
+            raise ValueError(f"Value {valueStr} in line {lineNumber} of the fasm file is wider than its feature")
+        address = start
+        while value:
+            if value & 1:
+                featureStr = f"{feature}[{address}]" if address else feature
+                if 'CLK' not in featureStr:
+                    tileVals = featureStr.split(".")
+                    if len(tileVals) < 3:
+                        raise Exception(f"Feature {featureStr} in fasm file has no tile location and feature name")
+                    yield tileVals[0], ".".join((tileVals[1], tileVals[2])), 1
+            value >>= 1
+            address += 1
+
+
+def scatterFeatureBits(planes, tileIndex, entries, spec: BitstreamSpec):
+    #planes holds the masked and unmasked bits of each tile, the targets of each (tile, feature entry) pair are
+    #expanded at once. For bits set by several features the feature with the highest name rank wins, bits of the same
+    #feature are applied in order.
+    if len(entries) == 0:
+        return
+    targetPtr, targetIndex, targetValue = spec.featureTargets()
+    starts = targetPtr[entries]
+    counts = targetPtr[entries + 1] - starts
+    featureOfBit = numpy.repeat(numpy.arange(len(entries)), counts)
+    targets = starts[featureOfBit] + numpy.arange(len(featureOfBit)) - (numpy.cumsum(counts) - counts)[featureOfBit]
+    flatIndex = tileIndex[featureOfBit] * planes.shape[-2] * planes.shape[-1] + targetIndex[targets]
+    priority = spec.nameRank[spec.featureName[entries]][featureOfBit]
+    order = numpy.lexsort((priority, flatIndex))
+    flatIndex = flatIndex[order]
+    lastIndex = numpy.append(flatIndex[1:] != flatIndex[:-1], True)
+    planes.reshape(-1)[flatIndex[lastIndex]] = targetValue[targets[order[lastIndex]]]
+
+
+def resolveFeatures(features, spec: BitstreamSpec):
+    #features yields (tileLoc, featureName, value) tuples, features with value 0 set no bits
+    #Returns the tile index (y * num_columns + x) and the feature entry of every feature as arrays
+    tileIndex, entries = [], []
+    for tileLoc, featureName, value in features:
+        if not value:
+            continue
+        x, y, template = spec.resolveTile(tileLoc)
+        entry = spec.findFeature(template, featureName)
+        if entry < 0:
+            raise Exception(f"Feature {featureName} of tile {tileLoc} ({spec.tileType(x, y)}) found in fasm file was not found in the bitstream spec")
+        tileIndex.append(y * spec.num_columns + x)
+        entries.append(entry)
+    return numpy.array(tileIndex, dtype=numpy.int64), numpy.array(entries, dtype=numpy.int64)
+
+
+def columnBitPlanes(tileIndex, entries, spec: BitstreamSpec, firstColumn: int, lastColumn: int):
+    #Returns the masked and unmasked bit planes of the columns firstColumn to lastColumn-1 as views of one
+    #(rows, columns, 2, tileBits) array. tileIndex and entries must only hold features of these columns.
+    num_columns = lastColumn - firstColumn
+    planes = numpy.zeros((spec.num_rows, num_columns, 2, spec.MaxFramesPerCol*spec.FrameBitsPerRow), dtype=numpy.uint8)
+    localIndex = tileIndex // spec.num_columns * num_columns + tileIndex % spec.num_columns - firstColumn
+    scatterFeatureBits(planes, localIndex, entries, spec)
+    plane, planeNoMask = planes[:, :, 0], planes[:, :, 1]
+
+    #NULL tiles never carry configuration data
+    plane[spec.tileTemplate[:, firstColumn:lastColumn] < 0] = 0
+    return plane, planeNoMask
+
+
+def buildBitPlanes(features, spec: BitstreamSpec):
+    tileIndex, entries = resolveFeatures(features, spec)
+    return columnBitPlanes(tileIndex, entries, spec, 0, spec.num_columns)
+
+
+def frameBitRows(plane, FrameBitsPerRow: int):
+    #Frame bits are written MSB first, so bit FrameBitsPerRow-1 of each frame comes first
+    frames = plane.reshape(plane.shape[0], plane.shape[1], -1, FrameBitsPerRow)
+    return frames[..., ::-1]
+
+
+def packFrames(plane, FrameBitsPerRow: int):
+    #Pack each frame into big endian bytes, left padding frames that are not a multiple of 8 bits wide
+    bitRows = frameBitRows(plane, FrameBitsPerRow)
+    padding = (-FrameBitsPerRow) % 8
+    if padding:
+        bitRows = numpy.concatenate(
+            (numpy.zeros(bitRows.shape[:-1] + (padding,), dtype=numpy.uint8), bitRows), axis=-1)
+    return numpy.packbits(bitRows, axis=-1)
+
+
+def frameSelectWord(column: int, frameIndex: int, FrameBitsPerRow: int = 32, FrameSelectWidth: int = 5) -> int:
+    #The frame select word is as wide as a frame row, its top FrameSelectWidth bits hold the column and bit frameIndex
+    #strobes the frame
+    return column << (FrameBitsPerRow - FrameSelectWidth) | 1 << frameIndex
+
+
+def checkFrameGeometry(num_rows: int, num_columns: int, archSpecs: dict):
+    #Raises a ValueError if the configuration logic described by archSpecs cannot address every frame of the fabric
+    FrameBitsPerRow = archSpecs["FrameBitsPerRow"]
+    MaxFramesPerCol = archSpecs["MaxFramesPerCol"]
+    FrameSelectWidth = archSpecs.get("FrameSelectWidth", 5)
+    RowSelectWidth = archSpecs.get("RowSelectWidth", 5)
+    DesyncFlag = archSpecs.get("DesyncFlag", 20)
+    #ConfigFSM takes the configuration data as 32 bit words, other frame widths need matching configuration logic
+    if FrameBitsPerRow != 32:
+        raise ValueError(f"A frame width of {FrameBitsPerRow} bits is not supported, the configuration logic (ConfigFSM) "
+                         "writes frames of 32 bits")
+    if num_columns > 1 << FrameSelectWidth:
+        raise ValueError(f"{num_columns} columns cannot be addressed with a frame select width of {FrameSelectWidth} bits")
+    if MaxFramesPerCol + FrameSelectWidth > FrameBitsPerRow:
+        raise ValueError(f"{MaxFramesPerCol} frames and a frame select width of {FrameSelectWidth} bits do not fit into "
+                         f"a frame select word of {FrameBitsPerRow} bits")
+    if MaxFramesPerCol > DesyncFlag:
+        raise ValueError(f"Frame {DesyncFlag} would set the desync flag, at most {DesyncFlag} frames per column are supported")
+    for column in range(num_columns):
+        if frameSelectWord(column, 0, FrameBitsPerRow, FrameSelectWidth) >> DesyncFlag & 1:
+            raise ValueError(f"The frame select word of column {column} would set the desync flag at bit {DesyncFlag}")
+    #The row select is all ones while no row is written
+    if num_rows - 2 > (1 << RowSelectWidth) - 2:
+        raise ValueError(f"{num_rows - 2} rows cannot be addressed with a row select width of {RowSelectWidth} bits")
+
+
+def frameSelectBytes(spec: BitstreamSpec):
+    #Returns the frame select word of every frame as a (columns, frames, bytes) array of big endian bytes
+    checkFrameGeometry(spec.num_rows, spec.num_columns, spec.archSpecs)
+    selectBytes = (spec.FrameBitsPerRow + 7) // 8
+    words = b"".join(frameSelectWord(column, frameIndex, spec.FrameBitsPerRow, spec.FrameSelectWidth).to_bytes(selectBytes, "big")
+                     for column in range(spec.num_columns) for frameIndex in range(spec.MaxFramesPerCol))
+    return numpy.frombuffer(words, dtype=numpy.uint8).reshape(spec.num_columns, spec.MaxFramesPerCol, selectBytes)
+
+
+BITSTREAM_HEADER = bytes.fromhex('00AAFF01000000010000000000000000FAB0FAB1')
+
+
+def frameRecords(packedFrames, spec: BitstreamSpec, firstColumn: int = 0):
+    #Returns the (columns, frames, bytes) frame records of the columns held by packedFrames, starting at firstColumn
+    num_rows, num_columns = packedFrames.shape[:2]
+    MaxFramesPerCol = spec.MaxFramesPerCol
+    selectWords = frameSelectBytes(spec)[firstColumn:firstColumn+num_columns]
+    # Top/bottom rows have no bitstream content, the remaining rows are written in reversed order
+    columnData = packedFrames[num_rows-2:0:-1].transpose(1, 2, 0, 3)
+    columnData = columnData.reshape(num_columns, MaxFramesPerCol, columnData.shape[2]*columnData.shape[3])
+    return numpy.concatenate((selectWords, columnData), axis=-1)
+
+
+def genBinaryBitstream(packedFrames, spec: BitstreamSpec, frameMask = None) -> bytes:
+    #frameMask is an optional (columns, frames) boolean array, only the selected frames are written
+    records = frameRecords(packedFrames, spec)
+    if frameMask is not None:
+        records = records[frameMask]
+    return BITSTREAM_HEADER + records.tobytes()
+
+
+def changedFrames(packedFrames, basePackedFrames):
+    #Returns a (columns, frames) boolean array of the frames whose data differs between the two bitstreams
+    num_rows = packedFrames.shape[0]
+    changed = packedFrames[1:num_rows-1] != basePackedFrames[1:num_rows-1]
+    return changed.any(axis=(0, 3))
+
+
+def bitCharRows(bits):
+    return numpy.where(bits, ord('1'), ord('0')).astype(numpy.uint8)
+
+
+#Side outputs
+#The .csv, .vh and .vhd files are only written when asked for. Each is generated lazily, one fabric row of the columns
+#held by a plane (starting at firstColumn) at a time and in the order of the file, so the writer streams it to disk and
+#column ranges generated separately are joined row by row.
+
+def csvRows(plane, spec: BitstreamSpec, firstColumn: int = 0):
+    FrameBitsPerRow = spec.FrameBitsPerRow
+    MaxFramesPerCol = spec.MaxFramesPerCol
+    charRows = bitCharRows(frameBitRows(plane, FrameBitsPerRow))
+    frameLabels = [f"frame{frameIndex},{frameIndex},{FrameBitsPerRow}," for frameIndex in range(MaxFramesPerCol)]
+    # Top/bottom rows have no bitstream content, the remaining rows are written in reversed order
+    for y in range(spec.num_rows - 2, 0, -1):
+        outStr = []
+        for i in range(plane.shape[1]):
+            x = firstColumn + i
+            tileKey = f"X{x}Y{y}"
+            outStr.append(",".join((tileKey, spec.tileType(x, y), str(x), str(y))) + "\n")
+            tileRows = charRows[y, i].tobytes().decode()
+            for frameIndex in range(MaxFramesPerCol):
+                outStr.append(frameLabels[frameIndex])
+                outStr.append(tileRows[frameIndex*FrameBitsPerRow:(frameIndex+1)*FrameBitsPerRow])
+                outStr.append("\n")
+            outStr.append("\n")
+        yield "".join(outStr)
+
+
+def verilogRows(planeNoMask, spec: BitstreamSpec, firstColumn: int = 0):
+    tileBits = planeNoMask.shape[-1]
+    charRows = bitCharRows(planeNoMask[..., ::-1])
+    for y in range(spec.num_rows):
+        verilog_str = []
+        for i in range(planeNoMask.shape[1]):
+            x = firstColumn + i
+            if not spec.hasFrameMap(x, y):
+                continue
+            verilog_str.append(f"// X{x}Y{y}, {spec.tileType(x, y)}\n")
+            verilog_str.append(f"`define Tile_X{x}Y{y}_Emulate_Bitstream {tileBits}'b")
+            verilog_str.append(charRows[y, i].tobytes().decode())
+            verilog_str.append("\n")
+        yield "".join(verilog_str)
+
+
+def vhdlRows(planeNoMask, spec: BitstreamSpec, firstColumn: int = 0):
+    tileBits = planeNoMask.shape[-1]
+    charRows = bitCharRows(planeNoMask[..., ::-1])
+    for y in range(spec.num_rows):
+        vhdl_str = []
+        for i in range(planeNoMask.shape[1]):
+            x = firstColumn + i
+            if not spec.hasFrameMap(x, y):
+                continue
+            vhdl_str.append(f"--X{x}Y{y}, {spec.tileType(x, y)}\n")
+            vhdl_str.append(f"constant Tile_X{x}Y{y}_Emulate_Bitstream : std_logic_vector({tileBits}-1 downto 0) := \"")
+            vhdl_str.append(charRows[y, i].tobytes().decode())
+            vhdl_str.append('";\n')
+        yield "".join(vhdl_str)
+
+
+sideOutputHeaders = {"vhd": 'library IEEE;\nuse IEEE.STD_LOGIC_1164.ALL;\n\npackage emulate_bitstream is\n'}
+sideOutputFooters = {"vhd": "end package emulate_bitstream;"}
+
+
+def writeSideOutputs(columnResults, spec: BitstreamSpec, bitstreamFile: str, outputs = SIDE_OUTPUTS):
+    #columnResults are genColumns results of consecutive column ranges, in column order
+    for ext in outputs:
+        with open(sideOutputFile(bitstreamFile, ext), "w") as f:
+            f.write(sideOutputHeaders.get(ext, ""))
+            for rowParts in zip(*(result[1][ext] for result in columnResults)):
+                f.writelines(rowParts)
+            f.write(sideOutputFooters.get(ext, "") + "\n")
+
+
+def genColumns(spec: BitstreamSpec, firstColumn: int, lastColumn: int, tileIndex, entries, outputs = SIDE_OUTPUTS):
+    #Returns the frame records of the columns firstColumn to lastColumn-1 and a dict with the row generator of each of
+    #the requested side outputs
+    plane, planeNoMask = columnBitPlanes(tileIndex, entries, spec, firstColumn, lastColumn)
+    records = frameRecords(packFrames(plane, spec.FrameBitsPerRow), spec, firstColumn).tobytes()
+    rowGenerators = {"csv": lambda: csvRows(plane, spec, firstColumn),
+                     "vh": lambda: verilogRows(planeNoMask, spec, firstColumn),
+                     "vhd": lambda: vhdlRows(planeNoMask, spec, firstColumn)}
+    return records, {ext: rowGenerators[ext]() for ext in outputs}
+
+
+def genMemoryImage(bitstream: bytes, size: int = 0, wordBytes: int = 1) -> bytes:
+    #One big endian word of wordBytes per line in hex digits, as read by $readmemh, padded with zero words to size bytes
+    if len(bitstream) > size:
+        size = len(bitstream)
+    words = numpy.zeros(-(-size // wordBytes) * wordBytes, dtype=numpy.uint8)
+    words[:len(bitstream)] = numpy.frombuffer(bitstream, dtype=numpy.uint8)
+    words = words.reshape(-1, wordBytes)
+    hexDigits = numpy.frombuffer(b"0123456789abcdef", dtype=numpy.uint8)
+    lines = numpy.empty((len(words), 2*wordBytes + 1), dtype=numpy.uint8)
+    lines[:, 0:-1:2] = hexDigits[words >> 4]
+    lines[:, 1:-1:2] = hexDigits[words & 0xF]
+    lines[:, -1] = ord("\n")
+    return lines.tobytes()
+
+
+def writeMemoryImages(bitstream: bytes, bitstreamFile: str, imageSize: int, wordBytes: int):
+    #The .hex image holds one byte per line for the testbenches, the .mem image one frame row wide word per line
+    if imageSize and len(bitstream) > imageSize:
+        print(f"Warning: the bitstream has {len(bitstream)} bytes and does not fit into a memory image of {imageSize} bytes, no memory images written")
+        return
+    with open(sideOutputFile(bitstreamFile, "hex"), "wb") as f:
+        f.write(genMemoryImage(bitstream, imageSize))
+    with open(sideOutputFile(bitstreamFile, "mem"), "wb") as f:
+        f.write(genMemoryImage(bitstream, imageSize, wordBytes))
+
+
+def genBitstreamNumpy(fasmFile: str, specFile: str, bitstreamFile: str, imageSize: int = None, processes: int = 1,
+                      outputs = SIDE_OUTPUTS):
+    genBitstreamFromSpec(fasmFile, loadBitstreamSpec(specFile), bitstreamFile, imageSize, processes, outputs)
+
+
+def genBitstreamFromSpec(fasmFile: str, spec: BitstreamSpec, bitstreamFile: str, imageSize: int = None,
+                         processes: int = 1, outputs = SIDE_OUTPUTS):
+    #With processes other than 1 the columns are generated in a worker pool, None uses all cores.
+    #outputs selects the side outputs written next to the .bin file, any of SIDE_OUTPUTS.
+    if processes == 1:
+        tileIndex, entries = resolveFeatures(readFasmFeatures(fasmFile), spec)
+        columnResults = [genColumns(spec, 0, spec.num_columns, tileIndex, entries, outputs)]
+    else:
+        columnResults = genColumnsParallel(fasmFile, spec, processes, outputs)
+
+    writeSideOutputs(columnResults, spec, bitstreamFile, outputs)
+    bitstream = BITSTREAM_HEADER + b"".join(result[0] for result in columnResults)
+    with open(bitstreamFile, 'bw+') as f:
+        f.write(bitstream)
+    if imageSize is not None:
+        writeMemoryImages(bitstream, bitstreamFile, imageSize, (spec.FrameBitsPerRow + 7) // 8)
+
+
+#Partial bitstreams
+#A partial bitstream only holds the frame records whose data differs from a base configuration, given either as a
+#bitstream or as the FASM file it was generated from. Frames are the smallest unit the configuration logic can write,
+#so a changed bit always costs the whole frame of its column.
+
+def loadPlane(configFile: str, spec: BitstreamSpec):
+    #Returns the bit plane of a bitstream or of a FASM file
+    with open(configFile, "rb") as f:
+        header = f.read(len(BITSTREAM_HEADER))
+    if header == BITSTREAM_HEADER:
+        with open(configFile, "rb") as f:
+            return readBinaryBitstream(f.read(), spec)
+    plane, _ = buildBitPlanes(readFasmFeatures(configFile), spec)
+    return plane
+
+
+def genPartialBitstream(baseFile: str, fasmFile: str, specFile: str, bitstreamFile: str):
+    #Returns the number of frames written and the number of frames of the full bitstream
+    spec = loadBitstreamSpec(specFile)
+    basePackedFrames = packFrames(loadPlane(baseFile, spec), spec.FrameBitsPerRow)
+    plane, _ = buildBitPlanes(readFasmFeatures(fasmFile), spec)
+    packedFrames = packFrames(plane, spec.FrameBitsPerRow)
+    frameMask = changedFrames(packedFrames, basePackedFrames)
+    with open(bitstreamFile, 'bw+') as f:
+        f.write(genBinaryBitstream(packedFrames, spec, frameMask))
+    return int(frameMask.sum()), frameMask.size
+
+
+#Compressed bitstreams
+#The configuration logic writes the data of a frame record to every frame whose bit is set in the frame select word.
+#A compressed bitstream uses this to write all frames of a column that hold the same data, all-zero frames included, with
+#a single record. It is loaded by the existing configuration logic without changes and decompressBitstream is the
+#reference for the expansion it performs.
+
+def genCompressedBinaryBitstream(packedFrames, spec: BitstreamSpec, skipZeroFrames: bool = False) -> bytes:
+    #skipZeroFrames drops all-zero frames entirely, which is only valid if the configuration memory is already cleared
+    num_rows, num_columns = packedFrames.shape[:2]
+    MaxFramesPerCol = spec.MaxFramesPerCol
+    checkFrameGeometry(spec.num_rows, spec.num_columns, spec.archSpecs)
+    selectBytes = (spec.FrameBitsPerRow + 7) // 8
+    columnData = packedFrames[num_rows-2:0:-1].transpose(1, 2, 0, 3)
+    columnData = columnData.reshape(num_columns, MaxFramesPerCol, columnData.shape[2]*columnData.shape[3])
+    records = [BITSTREAM_HEADER]
+    for column in range(num_columns):
+        frameGroups = {}
+        for frameIndex in range(MaxFramesPerCol):
+            frameGroups.setdefault(columnData[column, frameIndex].tobytes(), []).append(frameIndex)
+        for frameData, frameIndices in frameGroups.items():
+            if skipZeroFrames and not any(frameData):
+                continue
+            selectWord = 0
+            for frameIndex in frameIndices:
+                selectWord |= frameSelectWord(column, frameIndex, spec.FrameBitsPerRow, spec.FrameSelectWidth)
+            records.append(selectWord.to_bytes(selectBytes, "big"))
+            records.append(frameData)
+    return b"".join(records)
+
+
+def compressBitstream(bitstreamFile: str, specFile: str, compressedFile: str, skipZeroFrames: bool = False):
+    #Returns the size of the bitstream and of the compressed bitstream in bytes
+    spec = loadBitstreamSpec(specFile)
+    with open(bitstreamFile, "rb") as f:
+        bitstream = f.read()
+    packedFrames = packFrames(readBinaryBitstream(bitstream, spec), spec.FrameBitsPerRow)
+    compressed = genCompressedBinaryBitstream(packedFrames, spec, skipZeroFrames)
+    with open(compressedFile, "bw+") as f:
+        f.write(compressed)
+    return len(bitstream), len(compressed)
+
+
+def decompressBitstream(bitstream: bytes, spec: BitstreamSpec) -> bytes:
+    #Expands a compressed bitstream into one record per frame, as written by genBinaryBitstream
+    packedFrames = packFrames(readBinaryBitstream(bitstream, spec), spec.FrameBitsPerRow)
+    return genBinaryBitstream(packedFrames, spec)
+
+
+#Bitstream statistics
+#Reports the set bit density of every tile and column, the frames a bitstream writes and its size as a full, compressed
+#and partial bitstream, together with the time the configuration interfaces of the project template need to load it.
+#The interface models follow config_UART.v (10 bit times per byte at f_CLK/ComRate, two characters per byte in hex
+#mode), bitbang.v (32 s_clk periods per word) and the parallel SelfWriteData port of eFPGA_Config.v (one word per clock).
+
+def bitstreamStatistics(plane, spec: BitstreamSpec, basePlane = None) -> dict:
+    num_rows, num_columns = spec.num_rows, spec.num_columns
+    FrameBitsPerRow, MaxFramesPerCol = spec.FrameBitsPerRow, spec.MaxFramesPerCol
+    #Only the rows between the top and bottom row are written by the bitstream
+    tileSetBits = plane.sum(axis=-1, dtype=numpy.int64)
+    typeConfigBits = spec.typeFrameMask.sum(axis=-1, dtype=numpy.int64)
+    tileConfigBits = numpy.where(spec.tileTemplate >= 0,
+                                 typeConfigBits[spec.templateType[numpy.maximum(spec.tileTemplate, 0)]], 0)
+    frames = plane[1:num_rows-1].reshape(num_rows-2, num_columns, MaxFramesPerCol, FrameBitsPerRow)
+    nonEmptyFrames = frames.any(axis=(0, 3))
+
+    tiles = []
+    for y in range(1, num_rows - 1):
+        for x in range(num_columns):
+            if tileConfigBits[y, x]:
+                tiles.append((f"X{x}Y{y}", spec.tileType(x, y), int(tileSetBits[y, x]), int(tileConfigBits[y, x])))
+    columns = []
+    for x in range(num_columns):
+        columns.append((x, int(tileSetBits[1:num_rows-1, x].sum()), int(tileConfigBits[1:num_rows-1, x].sum()),
+                        int(nonEmptyFrames[x].sum())))
+
+    packedFrames = packFrames(plane, FrameBitsPerRow)
+    sizes = {"full": len(genBinaryBitstream(packedFrames, spec)),
+             "compressed": len(genCompressedBinaryBitstream(packedFrames, spec))}
+    if basePlane is not None:
+        frameMask = changedFrames(packedFrames, packFrames(basePlane, FrameBitsPerRow))
+        sizes["partial"] = len(genBinaryBitstream(packedFrames, spec, frameMask))
+    return {"tiles": tiles,
+            "columns": columns,
+            "setBits": int(tileSetBits[1:num_rows-1].sum()),
+            "configBits": int(tileConfigBits[1:num_rows-1].sum()),
+            "frames": nonEmptyFrames.size,
+            "nonEmptyFrames": int(nonEmptyFrames.sum()),
+            "sizes": sizes}
+
+
+def estimateConfigurationTime(size: int, clockFrequency: float, baudRate: float = 115200,
+                              bitbangFrequency: float = None, parallelWidth: int = 32) -> dict:
+    #Returns the seconds each configuration interface needs for a bitstream of size bytes
+    #The bitbang inputs are sampled with the system clock, s_clk defaults to a quarter of it
+    comRate = max(1, round(clockFrequency / baudRate))
+    if bitbangFrequency is None:
+        bitbangFrequency = clockFrequency / 4
+    return {"UART binary": size * 10 * comRate / clockFrequency,
+            "UART hex": size * 2 * 10 * comRate / clockFrequency,
+            "bitbang": math.ceil(size * 8 / 32) * 32 / bitbangFrequency,
+            "parallel": math.ceil(size * 8 / parallelWidth) / clockFrequency}
+
+
+def genBitstreamReport(stats: dict, spec: BitstreamSpec, clockFrequency: float, baudRate: float = 115200,
+                       bitbangFrequency: float = None, parallelWidth: int = 32) -> str:
+    def density(setBits, configBits):
+        return f"{100 * setBits / configBits:.2f}%" if configBits else "-"
+
+    sizes = stats["sizes"]
+    outStr = [f"Fabric: {spec.num_columns} columns, {spec.num_rows} rows, {spec.MaxFramesPerCol} frames of "
+              f"{spec.FrameBitsPerRow} bits per column\n",
+              f"Set bits: {stats['setBits']} of {stats['configBits']} configuration bits "
+              f"({density(stats['setBits'], stats['configBits'])})\n",
+              f"Non-empty frames: {stats['nonEmptyFrames']} of {stats['frames']}\n",
+              "Bitstream size: " + ", ".join(f"{kind} {size} bytes" for kind, size in sizes.items()) + "\n\n",
+              f"Configuration time at {clockFrequency / 1e6:g} MHz\n",
+              "interface," + ",".join(sizes) + "\n"]
+    times = {kind: estimateConfigurationTime(size, clockFrequency, baudRate, bitbangFrequency, parallelWidth)
+             for kind, size in sizes.items()}
+    for interface in times["full"]:
+        outStr.append(interface + "," + ",".join(f"{times[kind][interface] * 1e3:.3f} ms" for kind in sizes) + "\n")
+
+    outStr.append("\nColumn density\ncolumn,set bits,configuration bits,density,non-empty frames\n")
+    for x, setBits, configBits, nonEmptyFrames in stats["columns"]:
+        outStr.append(f"{x},{setBits},{configBits},{density(setBits, configBits)},{nonEmptyFrames}\n")
+    outStr.append("\nTile density\ntile,type,set bits,configuration bits,density\n")
+    for tileLoc, tileType, setBits, configBits in stats["tiles"]:
+        outStr.append(f"{tileLoc},{tileType},{setBits},{configBits},{density(setBits, configBits)}\n")
+    return "".join(outStr)
+
+
+def genBitstreamReportFile(configFile: str, specFile: str, reportFile: str, clockFrequency: float = 25e6,
+                           baudRate: float = 115200, baseFile: str = None):
+    #configFile and baseFile are either bitstreams or FASM files, the statistics are returned
+    spec = loadBitstreamSpec(specFile)
+    basePlane = loadPlane(baseFile, spec) if baseFile else None
+    stats = bitstreamStatistics(loadPlane(configFile, spec), spec, basePlane)
+    with open(reportFile, "w") as f:
+        f.write(genBitstreamReport(stats, spec, clockFrequency, baudRate))
+    return stats
+
+
+#Worker processes
+#The spec is loaded once and shared with the worker processes. Forked workers inherit the loaded spec without pickling
+#it, memory-mapped arrays stay shared.
+
+workerSpec = None
+
+
+def initSpecWorker(spec: BitstreamSpec):
+    global workerSpec
+    workerSpec = spec
+
+
+#Parallel generation
+#The frames and side outputs of a column only depend on the features of its tiles. The FASM file is parsed in line
+#aligned parts, then the fabric is split into column ranges which are generated separately and joined in order.
+
+def fasmFileParts(fasmFile: str, parts: int):
+    #Returns up to parts (startOffset, endOffset, firstLine) tuples covering the file, split at line starts
+    size = os.path.getsize(fasmFile)
+    bounds = [0]
+    with open(fasmFile, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, bounds[-1]))
+            f.readline()
+            if bounds[-1] < f.tell() < size:
+                bounds.append(f.tell())
+        bounds.append(size)
+        result = []
+        firstLine = 1
+        for startOffset, endOffset in zip(bounds, bounds[1:]):
+            result.append((startOffset, endOffset, firstLine))
+            f.seek(startOffset)
+            remaining = endOffset - startOffset
+            while remaining:
+                block = f.read(min(remaining, 1 << 24))
+                firstLine += block.count(b"\n")
+                remaining -= len(block)
+    return result
+
+
+def resolveFasmPart(job):
+    fasmFile, startOffset, endOffset, firstLine = job
+    return resolveFeatures(readFasmFeatures(fasmFile, startOffset, endOffset, firstLine), workerSpec)
+
+
+def genColumnsEntry(job):
+    #The row generators cannot be returned from the worker, the rows are generated here
+    records, sideOutputs = genColumns(workerSpec, *job)
+    return records, {ext: list(rows) for ext, rows in sideOutputs.items()}
+
+
+def genColumnsParallel(fasmFile: str, spec: BitstreamSpec, processes: int = None, outputs = SIDE_OUTPUTS):
+    #Returns the genColumns results of consecutive column ranges, in column order
+    processes = processes or os.cpu_count() or 1
+    with processPoolContext().Pool(processes, initializer=initSpecWorker, initargs=(spec,)) as pool:
+        parts = pool.map(resolveFasmPart, [(fasmFile,) + part for part in fasmFileParts(fasmFile, processes)])
+        tileIndex = numpy.concatenate([part[0] for part in parts])
+        entries = numpy.concatenate([part[1] for part in parts])
+        columns = tileIndex % spec.num_columns
+        bounds = numpy.unique(numpy.linspace(0, spec.num_columns, min(processes, spec.num_columns) + 1).astype(int))
+        jobs = []
+        for firstColumn, lastColumn in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            inRange = (columns >= firstColumn) & (columns < lastColumn)
+            jobs.append((firstColumn, lastColumn, tileIndex[inRange], entries[inRange], outputs))
+        return pool.map(genColumnsEntry, jobs)
+
+
+#Batch generation
+#Each worker process generates whole bitstreams. A failing design is reported in its result and does not abort the
+#rest of the batch.
+
+
+def genBatchEntry(job):
+    fasmFile, bitstreamFile, outputs = job
+    startTime = time.perf_counter()
+    try:
+        genBitstreamFromSpec(fasmFile, workerSpec, bitstreamFile, outputs=outputs)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return fasmFile, bitstreamFile, error, time.perf_counter() - startTime
+
+
+def genBitstreamBatch(fasmFiles, specFile: str, processes: int = None, outputs = SIDE_OUTPUTS):
+    #Yields (fasmFile, bitstreamFile, error, seconds) for every design as soon as it is done, error is None on success.
+    #The bitstream of each design is written next to its fasm file.
+    jobs = [(fasmFile, os.path.splitext(fasmFile)[0] + ".bin", outputs) for fasmFile in fasmFiles]
+    if not jobs:
+        return
+    spec = loadBitstreamSpec(specFile)
+    processes = min(processes or os.cpu_count() or 1, len(jobs))
+    if processes == 1:
+        initSpecWorker(spec)
+        yield from map(genBatchEntry, jobs)
+        return
+    with processPoolContext().Pool(processes, initializer=initSpecWorker, initargs=(spec,)) as pool:
+        yield from pool.imap_unordered(genBatchEntry, jobs)
+
+
+#Bitstream decoding
+#Turns a .bin file back into the FASM features it configures. The frames are unpacked into the bit plane the engine
+#writes, then every set bit is looked up in the inverted index of its tile template, so the work grows with the number
+#of set bits rather than with the size of the spec.
+
+def readBinaryBitstream(bitstream: bytes, spec: BitstreamSpec):
+    #Returns the bit plane of the bitstream, frames missing from the bitstream are left 0
+    if bitstream[:len(BITSTREAM_HEADER)] != BITSTREAM_HEADER:
+        raise ValueError("Bitstream does not start with the FABulous bitstream header")
+    FrameBitsPerRow = spec.FrameBitsPerRow
+    MaxFramesPerCol = spec.MaxFramesPerCol
+    checkFrameGeometry(spec.num_rows, spec.num_columns, spec.archSpecs)
+    frameBytes = (FrameBitsPerRow + 7) // 8
+    recordSize = frameBytes + (spec.num_rows - 2) * frameBytes
+    body = numpy.frombuffer(bitstream, dtype=numpy.uint8, offset=len(BITSTREAM_HEADER))
+    if len(body) % recordSize:
+        raise ValueError(f"Bitstream size does not match the frame size of {recordSize} bytes given by the spec")
+    records = body.reshape(-1, recordSize)
+
+    frameData = records[:, frameBytes:].reshape(len(records), spec.num_rows - 2, frameBytes)
+    frameBits = numpy.unpackbits(frameData, axis=-1)[..., frameBytes*8 - FrameBitsPerRow:][..., ::-1]
+    columnShift = FrameBitsPerRow - spec.FrameSelectWidth
+    plane = numpy.zeros((spec.num_rows, spec.num_columns, MaxFramesPerCol*FrameBitsPerRow), dtype=numpy.uint8)
+    for i in range(len(records)):
+        #Like the configuration logic, a record selecting several frames writes its data to all of them
+        word = int.from_bytes(records[i, :frameBytes].tobytes(), "big")
+        frameSelect = word & ((1 << columnShift) - 1)
+        column = word >> columnShift
+        if frameSelect == 0 or frameSelect >> MaxFramesPerCol or column >= spec.num_columns:
+            raise ValueError(f"Invalid frame select word {word:0{frameBytes*2}X} in frame record {i}")
+        for frameIndex in range(MaxFramesPerCol):
+            if frameSelect >> frameIndex & 1:
+                plane[spec.num_rows-2:0:-1, column, frameIndex*FrameBitsPerRow:(frameIndex+1)*FrameBitsPerRow] = frameBits[i]
+    return plane
+
+
+def decodeBitPlane(plane, spec: BitstreamSpec):
+    #Returns the decoded features in canonical FASM order and the (tileLoc, bit) pairs no decoded feature explains
+    features = []
+    unexplained = []
+    tileY, tileX, tileBit = numpy.nonzero(plane)
+    tileIndex = tileY * spec.num_columns + tileX
+    tileStarts = numpy.flatnonzero(numpy.diff(tileIndex, prepend=-1))
+    for start, end in zip(tileStarts.tolist(), numpy.append(tileStarts[1:], len(tileIndex)).tolist()):
+        x, y = int(tileX[start]), int(tileY[start])
+        tileLoc = f"X{x}Y{y}"
+        template = int(spec.tileTemplate[y, x])
+        setBits = tileBit[start:end].tolist()
+        if template < 0:
+            unexplained.extend((tileLoc, bit) for bit in setBits)
+            continue
+        index = spec.featureIndex(template)
+        tilePlane = plane[y, x]
+        explained = set()
+        for bit in setBits:
+            for entry, bitIndex, values in index.get(bit, ()):
+                if numpy.array_equal(tilePlane[bitIndex], values):
+                    features.append(f"{tileLoc}.{spec.featureNames[spec.featureName[entry]]}")
+                    explained.update(bitIndex[values == 1].tolist())
+        unexplained.extend((tileLoc, bit) for bit in setBits if bit not in explained)
+    return sorted(features), unexplained
+
+
+def decodeBitstream(bitstreamFile: str, specFile: str, fasmFile: str):
+    spec = loadBitstreamSpec(specFile)
+    with open(bitstreamFile, "rb") as f:
+        plane = readBinaryBitstream(f.read(), spec)
+    features, unexplained = decodeBitPlane(plane, spec)
+    with open(fasmFile, "w") as f:
+        f.writelines(f"{feature}\n" for feature in features)
+    for tileLoc, bit in unexplained:
+        print(f"Warning: bit {bit} of tile {tileLoc} is set, but is not part of any decoded feature")
+    return features, unexplained
+
+
+def decodeConfigBits(plane, spec: BitstreamSpec):
+    #Yields (tileLoc, tileType, configBits) for every tile whose ConfigMem encoding is in the spec, configBits holds the
+    #ConfigBits output of the tile's ConfigMem with bit 0 first
+    for tileLoc, x, y in spec.tileLocs():
+        typeIndex = spec.tileTypeIndex(x, y)
+        if typeIndex < 0:
+            continue
+        frameBits = spec.configBitFrameBits(typeIndex)
+        if len(frameBits) == 0:
+            continue
+        yield tileLoc, spec.tileTypes[typeIndex], numpy.where(frameBits >= 0, plane[y, x][frameBits], 0).astype(numpy.uint8)
+
+
+def decodeConfigBitsFile(bitstreamFile: str, specFile: str, csvFile: str):
+    #Writes one line per tile: tile location, tile type and its ConfigBits, most significant bit first like in the HDL
+    spec = loadBitstreamSpec(specFile)
+    with open(bitstreamFile, "rb") as f:
+        plane = readBinaryBitstream(f.read(), spec)
+    tiles = 0
+    with open(csvFile, "w") as f:
+        for tileLoc, tileType, configBits in decodeConfigBits(plane, spec):
+            f.write(f"{tileLoc},{tileType},{bitCharRows(configBits[::-1]).tobytes().decode()}\n")
+            tiles += 1
+    return tiles
 
 
 #This class represents individual tiles in the architecture
@@ -189,18 +1252,16 @@ class Fabric:
         self.height = inHeight
 
     def getTileByCoords(self, x: int, y: int):
-        for row in self.tiles:
-            for tile in row:
-                if tile.x == x and tile.y == y:
-                    return tile
+        # tiles[y][x] is the tile at (x, y)
+        if 0 <= y < len(self.tiles) and 0 <= x < len(self.tiles[y]):
+            return self.tiles[y][x]
         return None
 
     def getTileByLoc(self, loc: str):
-        for row in self.tiles:
-            for tile in row:
-                if tile.genTileLoc == loc:
-                    return tile
-        return None
+        m = re.fullmatch(r"X(\d+)Y(\d+)", loc)
+        if m is None:
+            return None
+        return self.getTileByCoords(int(m.group(1)), int(m.group(2)))
 
     def getTileAndWireByWireDest(self, loc: str, dest: str, jumps: bool = True):
         for row in self.tiles:
@@ -216,41 +1277,195 @@ class Fabric:
 
                         if (desttileLoc == loc) and (wire["destination"] + str(i) == dest):
                             return (tile, wire, i)
-
         return None
     
 #####################################################################################
 # Main
 #####################################################################################
 
-#Strip arguments
-caseProcessedArguments = list(map(lambda x: x.strip(), sys.argv))
-processedArguments = list(map(lambda x: x.lower(), caseProcessedArguments))
-flagRE = re.compile("-\S*")
+if __name__ == "__main__":
+    #Strip arguments
+    caseProcessedArguments = list(map(lambda x: x.strip(), sys.argv))
+    processedArguments = list(map(lambda x: x.lower(), caseProcessedArguments))
+    flagRE = re.compile("-\S*")
 
-if ('-genBitstream'.lower() in str(sys.argv).lower()):
-    argIndex = processedArguments.index('-genBitstream'.lower())
-    
-    if len(processedArguments) <= argIndex + 3:
-        raise ValueError('\nError: -genBitstream expect three file names - the fasm file, the spec file and the output file')
-    elif (flagRE.match(caseProcessedArguments[argIndex + 1])
-        or flagRE.match(caseProcessedArguments[argIndex + 2]) 
-        or flagRE.match(caseProcessedArguments[argIndex + 3])):
-        raise ValueError('\nError: -genBitstream expect three file names, but found a flag in the arguments:'
-            f' {caseProcessedArguments[argIndex + 1]}, {caseProcessedArguments[argIndex + 2]}, {caseProcessedArguments[argIndex + 3]}\n')
+    def parseOutputs():
+        #-outputs csv,vh,vhd selects the side outputs written next to the .bin file, none for only the .bin file
+        if '-outputs' not in processedArguments:
+            return SIDE_OUTPUTS
+        outputs = processedArguments[processedArguments.index('-outputs') + 1]
+        outputs = tuple(ext for ext in outputs.split(",") if ext and ext != "none")
+        for ext in outputs:
+            if ext not in SIDE_OUTPUTS:
+                raise ValueError(f"\nError: unknown output {ext}, valid options are {', '.join(SIDE_OUTPUTS)} and none")
+        return outputs
 
-    FasmFileName  = caseProcessedArguments[argIndex + 1]
-    SpecFileName  = caseProcessedArguments[argIndex + 2]
-    OutFileName  = caseProcessedArguments[argIndex + 3]
+    if ('-genBitstream'.lower() in processedArguments):
+        argIndex = processedArguments.index('-genBitstream'.lower())
 
-    genBitstream(FasmFileName, SpecFileName, OutFileName)
+        if len(processedArguments) <= argIndex + 3:
+            raise ValueError('\nError: -genBitstream expect three file names - the fasm file, the spec file and the output file')
+        elif (flagRE.match(caseProcessedArguments[argIndex + 1])
+            or flagRE.match(caseProcessedArguments[argIndex + 2]) 
+            or flagRE.match(caseProcessedArguments[argIndex + 3])):
+            raise ValueError('\nError: -genBitstream expect three file names, but found a flag in the arguments:'
+                f' {caseProcessedArguments[argIndex + 1]}, {caseProcessedArguments[argIndex + 2]}, {caseProcessedArguments[argIndex + 3]}\n')
 
+        FasmFileName  = caseProcessedArguments[argIndex + 1]
+        SpecFileName  = caseProcessedArguments[argIndex + 2]
+        OutFileName  = caseProcessedArguments[argIndex + 3]
 
+        engine = "legacy" if '-legacy' in processedArguments else "numpy"
+        imageSize = None
+        if '-hex' in processedArguments:
+            imageSize = int(caseProcessedArguments[processedArguments.index('-hex') + 1])
+        processes = 1
+        if '-parallel' in processedArguments:
+            argIndex = processedArguments.index('-parallel')
+            processes = None
+            if len(processedArguments) > argIndex + 1 and processedArguments[argIndex + 1].isdigit():
+                processes = int(processedArguments[argIndex + 1])
+        genBitstream(FasmFileName, SpecFileName, OutFileName, engine, imageSize, processes, parseOutputs())
 
-if ('-help'.lower() in str(sys.argv).lower()) or ('-h' in str(sys.argv).lower()):
-    print('')   
-    print('Options/Switches')   
-    print('  -genBitstream foo.fasm spec.txt bitstream.txt - generates a bitstream - the first file is the fasm file, the second is the bitstream spec and the third is the fasm file to write to')
-    
+    if ('-genBitstreamBatch'.lower() in processedArguments):
+        argIndex = processedArguments.index('-genBitstreamBatch'.lower())
+
+        if len(processedArguments) <= argIndex + 2:
+            raise ValueError('\nError: -genBitstreamBatch expect the spec file followed by at least one fasm file')
+
+        SpecFileName = caseProcessedArguments[argIndex + 1]
+        FasmFileNames = [i for i in caseProcessedArguments[argIndex + 2:] if not flagRE.match(i)]
+        if '-outputs' in processedArguments:
+            FasmFileNames.remove(caseProcessedArguments[processedArguments.index('-outputs') + 1])
+
+        failed = 0
+        for done, (fasmFile, bitstreamFile, error, seconds) in enumerate(genBitstreamBatch(FasmFileNames, SpecFileName, outputs=parseOutputs()), 1):
+            if error:
+                failed += 1
+                print(f"[{done}/{len(FasmFileNames)}] {fasmFile} failed:\n{error}")
+            else:
+                print(f"[{done}/{len(FasmFileNames)}] {bitstreamFile} generated in {seconds:.2f}s")
+        if failed:
+            sys.exit(f"{failed} of {len(FasmFileNames)} bitstreams failed")
+
+    if ('-compileSpec'.lower() in processedArguments):
+        argIndex = processedArguments.index('-compileSpec'.lower())
+
+        if len(processedArguments) <= argIndex + 2:
+            raise ValueError('\nError: -compileSpec expect two file names - the pickled spec file and the output file')
+
+        SpecFileName  = caseProcessedArguments[argIndex + 1]
+        OutFileName  = caseProcessedArguments[argIndex + 2]
+
+        loadBitstreamSpec(SpecFileName).save(OutFileName)
+
+    if ('-genPartialBitstream'.lower() in processedArguments):
+        argIndex = processedArguments.index('-genPartialBitstream'.lower())
+
+        if len(processedArguments) <= argIndex + 4:
+            raise ValueError('\nError: -genPartialBitstream expect four file names - the base bitstream or fasm file, the new fasm file, the spec file and the output file')
+
+        BaseFileName = caseProcessedArguments[argIndex + 1]
+        FasmFileName  = caseProcessedArguments[argIndex + 2]
+        SpecFileName  = caseProcessedArguments[argIndex + 3]
+        OutFileName  = caseProcessedArguments[argIndex + 4]
+
+        written, total = genPartialBitstream(BaseFileName, FasmFileName, SpecFileName, OutFileName)
+        print(f"Partial bitstream holds {written} of {total} frames")
+
+    if ('-compressBitstream'.lower() in processedArguments):
+        argIndex = processedArguments.index('-compressBitstream'.lower())
+
+        if len(processedArguments) <= argIndex + 3:
+            raise ValueError('\nError: -compressBitstream expect three file names - the bitstream file, the spec file and the output file')
+
+        BitstreamFileName = caseProcessedArguments[argIndex + 1]
+        SpecFileName  = caseProcessedArguments[argIndex + 2]
+        OutFileName  = caseProcessedArguments[argIndex + 3]
+
+        size, compressedSize = compressBitstream(BitstreamFileName, SpecFileName, OutFileName, '-skipZeroFrames'.lower() in processedArguments)
+        print(f"Compressed bitstream from {size} to {compressedSize} bytes")
+
+    if ('-decompressBitstream'.lower() in processedArguments):
+        argIndex = processedArguments.index('-decompressBitstream'.lower())
+
+        if len(processedArguments) <= argIndex + 3:
+            raise ValueError('\nError: -decompressBitstream expect three file names - the compressed bitstream file, the spec file and the output file')
+
+        BitstreamFileName = caseProcessedArguments[argIndex + 1]
+        SpecFileName  = caseProcessedArguments[argIndex + 2]
+        OutFileName  = caseProcessedArguments[argIndex + 3]
+
+        with open(BitstreamFileName, "rb") as f:
+            bitstream = decompressBitstream(f.read(), loadBitstreamSpec(SpecFileName))
+        with open(OutFileName, "bw+") as f:
+            f.write(bitstream)
+
+    if ('-bitstreamReport'.lower() in processedArguments):
+        argIndex = processedArguments.index('-bitstreamReport'.lower())
+
+        if len(processedArguments) <= argIndex + 3:
+            raise ValueError('\nError: -bitstreamReport expect three file names - the bitstream or fasm file, the spec file and the report file')
+
+        ConfigFileName = caseProcessedArguments[argIndex + 1]
+        SpecFileName  = caseProcessedArguments[argIndex + 2]
+        OutFileName  = caseProcessedArguments[argIndex + 3]
+
+        clockFrequency = 25e6
+        baudRate = 115200
+        BaseFileName = None
+        if '-clockFrequency'.lower() in processedArguments:
+            clockFrequency = float(caseProcessedArguments[processedArguments.index('-clockFrequency'.lower()) + 1])
+        if '-baudRate'.lower() in processedArguments:
+            baudRate = float(caseProcessedArguments[processedArguments.index('-baudRate'.lower()) + 1])
+        if '-base' in processedArguments:
+            BaseFileName = caseProcessedArguments[processedArguments.index('-base') + 1]
+
+        genBitstreamReportFile(ConfigFileName, SpecFileName, OutFileName, clockFrequency, baudRate, BaseFileName)
+
+    if ('-decodeBitstream'.lower() in processedArguments):
+        argIndex = processedArguments.index('-decodeBitstream'.lower())
+
+        if len(processedArguments) <= argIndex + 3:
+            raise ValueError('\nError: -decodeBitstream expect three file names - the bitstream file, the spec file and the output fasm file')
+
+        BitstreamFileName = caseProcessedArguments[argIndex + 1]
+        SpecFileName  = caseProcessedArguments[argIndex + 2]
+        OutFileName  = caseProcessedArguments[argIndex + 3]
+
+        features, unexplained = decodeBitstream(BitstreamFileName, SpecFileName, OutFileName)
+        print(f"Decoded {len(features)} features, {len(unexplained)} set bits are not part of any feature")
+
+    if ('-decodeConfigBits'.lower() in processedArguments):
+        argIndex = processedArguments.index('-decodeConfigBits'.lower())
+
+        if len(processedArguments) <= argIndex + 3:
+            raise ValueError('\nError: -decodeConfigBits expect three file names - the bitstream file, the spec file and the output csv file')
+
+        BitstreamFileName = caseProcessedArguments[argIndex + 1]
+        SpecFileName  = caseProcessedArguments[argIndex + 2]
+        OutFileName  = caseProcessedArguments[argIndex + 3]
+
+        tiles = decodeConfigBitsFile(BitstreamFileName, SpecFileName, OutFileName)
+        if tiles == 0:
+            print("Warning: the bitstream spec does not hold the ConfigMem encoding, regenerate it to decode the ConfigBits")
 
 
+    if ('-help' in processedArguments) or ('-h' in processedArguments):
+        print('')   
+        print('Options/Switches')   
+        print('  -genBitstream foo.fasm spec.txt bitstream.txt - generates a bitstream - the first file is the fasm file, the second is the bitstream spec and the third is the fasm file to write to')
+        print('  -legacy - use the list based bitstream engine instead of the NumPy bit-plane engine')
+        print('  -parallel [processes] - with -genBitstream, generate the columns of the bitstream in a worker pool, using all cores if no number is given')
+        print('  -outputs csv,vh,vhd - with -genBitstream or -genBitstreamBatch, the side outputs written next to the .bin file, none for only the .bin file (default all)')
+        print('  -hex 16384 - with -genBitstream, also write .hex (one byte per line) and .mem (one frame row wide word per line) memory images padded to the given number of bytes, 0 for no padding')
+        print('  -genBitstreamBatch spec.bin foo.fasm bar.fasm ... - generates the bitstreams of many fasm files in one process pool, each next to its fasm file')
+        print('  -compileSpec spec.bin spec.compiled.bin - converts a pickled bitstream spec into the compiled, memory-mappable spec format')
+        print('  -genPartialBitstream base.bin foo.fasm spec.bin partial.bin - generates a bitstream holding only the frames that differ from the base bitstream or fasm file')
+        print('  -compressBitstream bitstream.bin spec.bin compressed.bin - writes all frames of a column holding the same data with one frame record')
+        print('  -skipZeroFrames - with -compressBitstream, leave out all-zero frames, only valid for cleared configuration memory')
+        print('  -decompressBitstream compressed.bin spec.bin bitstream.bin - expands a compressed bitstream into one frame record per frame')
+        print('  -bitstreamReport foo.bin spec.bin report.txt - writes the set bit density, frame usage and configuration time estimate of a bitstream or fasm file')
+        print('  -clockFrequency 25e6, -baudRate 115200, -base base.bin - with -bitstreamReport, the configuration clock in Hz, the UART baud rate and a base configuration for the partial bitstream size')
+        print('  -decodeBitstream bitstream.bin spec.bin foo.fasm - decodes a bitstream back into the fasm features it configures')
+        print('  -decodeConfigBits bitstream.bin spec.bin configBits.csv - decodes the ConfigBits each tile ConfigMem outputs for a bitstream')
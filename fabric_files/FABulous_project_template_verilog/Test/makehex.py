@@ -18,9 +18,8 @@ with open(binfile, "rb") as f:
 
 assert len(bindata) <= nbytes
 
+lines = [f"{byte:02x}\n" for byte in bindata]
+lines.extend(["0\n"] * (nbytes - len(bindata)))
+
 with open(outfile, "w") as f:
-    for i in range(nbytes):
-        if i < len(bindata):
-            print(f"{bindata[i]:02x}", file=f)
-        else:
-            print("0", file=f)
+    f.write("".join(lines))
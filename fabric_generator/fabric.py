@@ -3,6 +3,8 @@ from typing import Any, Literal, List, Dict, Tuple
 import math
 from enum import Enum
 import os
+import re
+import numpy
 
 
 class IO(Enum):
@@ -38,8 +40,30 @@ class ConfigBitMode(Enum):
     FLIPFLOP_CHAIN = "FLIPFLOP_CHAIN"
 
 
+class Immutable():
+    """
+    Base class of the frozen data classes with `__slots__`. Their instances cannot be modified, so a copy or deep copy
+    returns the instance itself and all the tiles of a type share the same ports. A frozen data class cannot be
+    restored attribute by attribute, so the instances are pickled as the tuple of their slots.
+    """
+    __slots__ = ()
+
+    def __copy__(self) -> "Immutable":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Immutable":
+        return self
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
 @dataclass(frozen=True, eq=True)
-class Port():
+class Port(Immutable):
     """
     The port data class contains all the port information from the CSV file.
     The `name`, `inOut` and `sideOfTile` are added attributes to aid the generation of the fabric.
@@ -60,6 +84,8 @@ class Port():
         inOut (IO): The IO direction of the port
         sideOfTile (Side): The side which the port is physically located on the tile
     """
+    __slots__ = ("wireDirection", "sourceName", "xOffset", "yOffset", "destinationName", "wireCount", "name",
+                 "inOut", "sideOfTile")
     wireDirection: Direction
     sourceName: str
     xOffset: int
@@ -163,9 +189,10 @@ class Port():
 
 
 @dataclass(frozen=True, eq=True)
-class Wire():
+class Wire(Immutable):
     """
     This class is for wire connection that span across multiple tiles. If working for connection between two adjacent tiles, the Port class should have all the required information. The main use of this class is to assist model generation, where information at individual wire level is needed.
+    A wire is relative to the tile it starts in, so all tiles of the same type share the same wires. The source and destination tile of a placed wire are given by `getSourceTile` and `getDestinationTile`.
 
     Attributes:
         direction (Direction): The direction of the wire
@@ -173,16 +200,19 @@ class Wire():
         xOffset (int): The X-offset of the wire
         yOffset (int): The Y-offset of the wire
         destination (str): The destination name of the wire
-        sourceTile (str): The source tile name of the wire
-        destinationTile (str): The destination tile name of the wire
     """
+    __slots__ = ("direction", "source", "xOffset", "yOffset", "destination")
     direction: Direction
     source: str
     xOffset: int
     yOffset: int
     destination: str
-    sourceTile: str
-    destinationTile: str
+
+    def getSourceTile(self, x: int, y: int) -> str:
+        return f"X{x}Y{y}"
+
+    def getDestinationTile(self, x: int, y: int) -> str:
+        return f"X{x+self.xOffset}Y{y+self.yOffset}"
 
     def __repr__(self) -> str:
         return f"{self.source}-X{self.xOffset}Y{self.yOffset}>{self.destination}"
@@ -218,6 +248,8 @@ class Bel():
         belFeatureMap (Dict[str, dict]) : The feature map of the BEL.
         withUserCLK (bool) : Whether the BEL has userCLK port. Default is False.
     """
+    __slots__ = ("src", "prefix", "name", "inputs", "outputs", "externalInput", "externalOutput", "configPort",
+                 "sharedPort", "configBit", "belFeatureMap", "withUserCLK")
     src: str
     prefix: str
     name: str
@@ -228,8 +260,8 @@ class Bel():
     configPort: List[str]
     sharedPort: List[Tuple[str, IO]]
     configBit: int
-    belFeatureMap: Dict[str, dict] = field(default_factory=dict)
-    withUserCLK: bool = False
+    belFeatureMap: Dict[str, dict]
+    withUserCLK: bool
 
     def __init__(self, src: str, prefix: str, internal, external, configPort, sharedPort, configBit: int, belMap: Dict[str, dict], userCLK: bool) -> None:
         self.src = src
@@ -247,7 +279,7 @@ class Bel():
 
 
 @dataclass(frozen=True, eq=True)
-class ConfigMem():
+class ConfigMem(Immutable):
     """
     Data structure to store the information about a config memory. Each structure represent a row of entry in the config memory csv file.
 
@@ -256,13 +288,105 @@ class ConfigMem():
         frameIndex (int) : The index of the frame
         bitUsedInFrame (int) : The number of bits used in the frame
         usedBitMask (int) : The bit mask of the bits used in the frame
-        configBitRanges (List[int]) : A list of config bit mapping values 
+        configBitRanges (Tuple[int, ...]) : The config bit mapping values, a tuple so that the entry stays immutable
     """
+    __slots__ = ("frameName", "frameIndex", "bitsUsedInFrame", "usedBitMask", "configBitRanges")
     frameName: str
     frameIndex: int
     bitsUsedInFrame: int
     usedBitMask: str
-    configBitRanges: List[int] = field(default_factory=list)
+    configBitRanges: Tuple[int, ...]
+
+
+@dataclass(frozen=True, eq=True)
+class ConfigMemEncoding(Immutable):
+    """
+    The mapping between the configuration bits of a tile type and the bits of its frames, as given by the config memory
+    csv file. A frame bit is addressed as frameIndex * frameBitsPerRow + bit, where bit 0 is the last character of the
+    used bit mask. The encoding is computed once per config memory file and shared by the bitstream specification and
+    the config memory RTL generation.
+
+    Attributes:
+        configMems (Tuple[ConfigMem, ...]) : The config memory entries the encoding is derived from
+        configBitToFrameBit (Tuple[int, ...]) : The frame bit of each config bit, -1 if the config bit is not mapped
+        frameBitToConfigBit (Tuple[int, ...]) : The config bit of each frame bit, -1 if the frame bit is not used
+    """
+    __slots__ = ("configMems", "configBitToFrameBit", "frameBitToConfigBit")
+    configMems: Tuple[ConfigMem, ...]
+    configBitToFrameBit: Tuple[int, ...]
+    frameBitToConfigBit: Tuple[int, ...]
+
+
+class SwitchMatrix():
+    """
+    The switch matrix of a tile type in compressed sparse row form. The multiplexer outputs are the rows of the matrix
+    csv file and the inputs of output i are sourceIndex[rowPtr[i]:rowPtr[i+1]], in the order of the columns of the csv
+    file. Port names are interned in portNames, outputs and inputs refer to them by index.
+
+    Attributes:
+        portNames (Tuple[str, ...]) : The interned names of all the ports of the switch matrix
+        portIndex (Dict[str, int]) : The index of each port name in portNames
+        muxOutputs (numpy.ndarray) : The port index of each multiplexer output, in the order of the csv file
+        muxIndex (Dict[str, int]) : The multiplexer index of each output port name
+        rowPtr (numpy.ndarray) : The start of the inputs of each multiplexer in sourceIndex, plus the end of the last one
+        sourceIndex (numpy.ndarray) : The port index of the inputs of all multiplexers
+        fanIn (numpy.ndarray) : The number of inputs of each multiplexer
+        configBits (numpy.ndarray) : The number of config bits of each multiplexer
+        noConfigBits (int) : The number of config bits of the switch matrix
+    """
+
+    def __init__(self, connections: Dict[str, List[str]]) -> None:
+        """
+        Build the switch matrix from the dictionary returned by `parseMatrix`.
+
+        Args:
+            connections (Dict[str, List[str]]): dictionary from multiplexer output to its list of inputs
+        """
+        self.portIndex = {}
+        for output, inputs in connections.items():
+            self.portIndex.setdefault(output, len(self.portIndex))
+            for i in inputs:
+                self.portIndex.setdefault(i, len(self.portIndex))
+        self.portNames = tuple(self.portIndex)
+        self.muxIndex = {output: i for i, output in enumerate(connections)}
+        self.muxOutputs = numpy.array([self.portIndex[output] for output in connections], dtype=numpy.int32)
+        self.fanIn = numpy.array([len(inputs) for inputs in connections.values()], dtype=numpy.int32)
+        self.rowPtr = numpy.concatenate(([0], numpy.cumsum(self.fanIn, dtype=numpy.int64)))
+        self.sourceIndex = numpy.array([self.portIndex[i] for inputs in connections.values() for i in inputs],
+                                       dtype=numpy.int32)
+        self.configBits = numpy.array([max(len(inputs).bit_length() - 1, 0) for inputs in connections.values()],
+                                      dtype=numpy.int32)
+        self.noConfigBits = int(self.configBits.sum())
+
+    def getFanIn(self, output: str) -> int:
+        return int(self.fanIn[self.muxIndex[output]])
+
+    def getConfigBits(self, output: str) -> int:
+        return int(self.configBits[self.muxIndex[output]])
+
+    def getInputs(self, output: str) -> List[str]:
+        i = self.muxIndex[output]
+        return [self.portNames[j] for j in self.sourceIndex[self.rowPtr[i]:self.rowPtr[i+1]].tolist()]
+
+    def getConnections(self) -> Dict[str, List[str]]:
+        """
+        Returns:
+            Dict[str, List[str]]: A new dictionary from multiplexer output to its list of inputs, as returned by `parseMatrix`
+        """
+        names = self.portNames
+        rowPtr = self.rowPtr.tolist()
+        sourceIndex = self.sourceIndex.tolist()
+        return {names[output]: [names[j] for j in sourceIndex[rowPtr[i]:rowPtr[i+1]]]
+                for i, output in enumerate(self.muxOutputs.tolist())}
+
+    def getPips(self) -> List[Tuple[str, str]]:
+        """
+        Returns:
+            List[Tuple[str, str]]: The (output, input) pair of every programmable connection, in the order of the csv file
+        """
+        names = self.portNames
+        outputs = numpy.repeat(self.muxOutputs, self.fanIn).tolist()
+        return [(names[o], names[i]) for o, i in zip(outputs, self.sourceIndex.tolist())]
 
 
 @dataclass
@@ -278,17 +402,22 @@ class Tile():
         withUserCLK (bool) : Whether the tile has userCLK port. Default is False.
         wireList (List[Wire]) : The list of wires of the tile
         filePath (str) : The path of the matrix file
+        partOfSuperTile (bool) : Whether the tile is part of a super tile
+        switchMatrix (SwitchMatrix) : The switch matrix parsed from the matrix file, set by `getSwitchMatrix`
     """
+    __slots__ = ("name", "portsInfo", "bels", "matrixDir", "globalConfigBits", "withUserCLK", "wireList", "filePath",
+                 "partOfSuperTile", "switchMatrix")
 
     name: str
     portsInfo: List[Port]
     bels: List[Bel]
     matrixDir: str
-    globalConfigBits: int = 0
-    withUserCLK: bool = False
-    wireList: List[Wire] = field(default_factory=list)
-    filePath: str = "."
-    partOfSuperTile = False
+    globalConfigBits: int
+    withUserCLK: bool
+    wireList: List[Wire]
+    filePath: str
+    partOfSuperTile: bool
+    switchMatrix: SwitchMatrix
 
     def __init__(self, name: str, ports: List[Port], bels: List[Bel], matrixDir: str, userCLK: bool, configBit: int = 0) -> None:
         self.name = name
@@ -299,6 +428,8 @@ class Tile():
         self.globalConfigBits = configBit
         self.wireList = []
         self.filePath = os.path.split(matrixDir)[0]
+        self.partOfSuperTile = False
+        self.switchMatrix = None
 
         for b in self.bels:
             self.globalConfigBits += b.configBit
@@ -431,6 +562,7 @@ class Fabric():
         superTileEnable (bool) : Whether the fabric has super tile.
         tileDic (Dict[str, Tile]) : A dictionary of tiles used in the fabric. The key is the name of the tile and the value is the tile. 
         superTileDic (Dict[str, SuperTile]) : A dictionary of super tiles used in the fabric. The key is the name of the super tile and the value is the super tile.
+        wireDatabase (WireDatabase) : The wires of the fabric in struct-of-arrays form, built by `getWireDatabase`
 
     """
 
@@ -455,39 +587,52 @@ class Fabric():
     superTileDic: Dict[str, SuperTile] = field(default_factory=dict)
     # wires: List[Wire] = field(default_factory=list)
     commonWirePair: List[Tuple[str, str]] = field(default_factory=list)
+    wireDatabase: "WireDatabase" = field(default=None, compare=False)
 
     def __post_init__(self) -> None:
         """
         Generate all the wire pair in the fabric and get all the wire in the fabric. 
         The wire pair are used during model generation when some of the signals have source or destination of "NULL".
         The wires are used during model generation to work with wire that going cross tile.
+        The wires are generated once per tile type and the same list is shared by all the tiles of that type.
         """
+        # all placements of a tile type have the same ports
+        tileTypes: Dict[str, Tile] = {}
         for row in self.tile:
             for tile in row:
-                if tile == None:
-                    continue
-                for port in tile.portsInfo:
-                    self.commonWirePair.append(
-                        (port.sourceName, port.destinationName))
+                if tile != None:
+                    tileTypes.setdefault(tile.name, tile)
+        for tile in tileTypes.values():
+            for port in tile.portsInfo:
+                self.commonWirePair.append(
+                    (port.sourceName, port.destinationName))
 
         self.commonWirePair = list(dict.fromkeys(self.commonWirePair))
         self.commonWirePair = [
             (i, j) for i, j in self.commonWirePair if i != "NULL" and j != "NULL"]
 
-        for y, row in enumerate(self.tile):
-            for x, tile in enumerate(row):
+        # destination of the first common wire pair of each source name
+        commonWireDestination: Dict[str, str] = {}
+        for i, j in self.commonWirePair:
+            commonWireDestination.setdefault(i, j)
+
+        wireTemplates: Dict[str, List[Wire]] = {}
+        for row in self.tile:
+            for tile in row:
                 if tile == None:
                     continue
+                if tile.name in wireTemplates:
+                    tile.wireList = wireTemplates[tile.name]
+                    continue
+                wireList: List[Wire] = []
                 for port in tile.portsInfo:
                     if abs(port.xOffset) <= 1 and abs(port.yOffset) <= 1 and port.sourceName != "NULL" and port.destinationName != "NULL":
                         for i in range(port.wireCount):
-                            tile.wireList.append(Wire(direction=port.wireDirection,
-                                                      source=f"{port.sourceName}{i}",
-                                                      xOffset=port.xOffset,
-                                                      yOffset=port.yOffset,
-                                                      destination=f"{port.destinationName}{i}",
-                                                      sourceTile="",
-                                                      destinationTile=""))
+                            wireList.append(Wire(direction=port.wireDirection,
+                                                 source=f"{port.sourceName}{i}",
+                                                 xOffset=port.xOffset,
+                                                 yOffset=port.yOffset,
+                                                 destination=f"{port.destinationName}{i}"))
                     elif port.sourceName != "NULL" and port.destinationName != "NULL":
                         # clamp the xOffset to 1 or -1
                         value = min(max(port.xOffset, -1), 1)
@@ -498,20 +643,16 @@ class Fabric():
                                     (abs(port.xOffset)-1)
                             else:
                                 cascadedI = i - port.wireCount
-                                tile.wireList.append(Wire(direction=Direction.JUMP,
-                                                          source=f"{port.destinationName}{i}",
-                                                          xOffset=0,
-                                                          yOffset=0,
-                                                          destination=f"{port.sourceName}{i}",
-                                                          sourceTile=f"X{x}Y{y}",
-                                                          destinationTile=f"X{x}Y{y}"))
-                            tile.wireList.append(Wire(direction=port.wireDirection,
-                                                      source=f"{port.sourceName}{i}",
-                                                      xOffset=value,
-                                                      yOffset=port.yOffset,
-                                                      destination=f"{port.destinationName}{cascadedI}",
-                                                      sourceTile=f"X{x}Y{y}",
-                                                      destinationTile=f"X{x+value}Y{y+port.yOffset}"))
+                                wireList.append(Wire(direction=Direction.JUMP,
+                                                     source=f"{port.destinationName}{i}",
+                                                     xOffset=0,
+                                                     yOffset=0,
+                                                     destination=f"{port.sourceName}{i}"))
+                            wireList.append(Wire(direction=port.wireDirection,
+                                                 source=f"{port.sourceName}{i}",
+                                                 xOffset=value,
+                                                 yOffset=port.yOffset,
+                                                 destination=f"{port.destinationName}{cascadedI}"))
 
                         # clamp the yOffset to 1 or -1
                         value = min(max(port.yOffset, -1), 1)
@@ -522,52 +663,43 @@ class Fabric():
                                     (abs(port.yOffset)-1)
                             else:
                                 cascadedI = i - port.wireCount
-                                tile.wireList.append(Wire(direction=Direction.JUMP,
-                                                          source=f"{port.destinationName}{i}",
-                                                          xOffset=0,
-                                                          yOffset=0,
-                                                          destination=f"{port.sourceName}{i}",
-                                                          sourceTile=f"X{x}Y{y}",
-                                                          destinationTile=f"X{x}Y{y}"))
-                            tile.wireList.append(Wire(direction=port.wireDirection,
-                                                      source=f"{port.sourceName}{i}",
-                                                      xOffset=port.xOffset,
-                                                      yOffset=value,
-                                                      destination=f"{port.destinationName}{cascadedI}",
-                                                      sourceTile=f"X{x}Y{y}",
-                                                      destinationTile=f"X{x+port.xOffset}Y{y+value}"))
+                                wireList.append(Wire(direction=Direction.JUMP,
+                                                     source=f"{port.destinationName}{i}",
+                                                     xOffset=0,
+                                                     yOffset=0,
+                                                     destination=f"{port.sourceName}{i}"))
+                            wireList.append(Wire(direction=port.wireDirection,
+                                                 source=f"{port.sourceName}{i}",
+                                                 xOffset=port.xOffset,
+                                                 yOffset=value,
+                                                 destination=f"{port.destinationName}{cascadedI}"))
                     elif port.sourceName != "NULL" and port.destinationName == "NULL":
                         sourceName = port.sourceName
-                        destName = ""
-                        try:
-                            index = [i for i, _ in self.commonWirePair].index(
-                                port.sourceName)
-                            sourceName = self.commonWirePair[index][0]
-                            destName = self.commonWirePair[index][1]
-                        except:
-                            # if is not in a common pair wire we assume the source name is same as destination name
-                            destName = sourceName
+                        # if is not in a common pair wire we assume the source name is same as destination name
+                        destName = commonWireDestination.get(
+                            sourceName, sourceName)
 
                         value = min(max(port.xOffset, -1), 1)
                         for i in range(port.wireCount*abs(port.xOffset)):
-                            tile.wireList.append(Wire(direction=port.wireDirection,
-                                                      source=f"{sourceName}{i}",
-                                                      xOffset=value,
-                                                      yOffset=port.yOffset,
-                                                      destination=f"{destName}{i}",
-                                                      sourceTile=f"X{x}Y{y}",
-                                                      destinationTile=f"X{x+value}Y{y+port.yOffset}"))
+                            wireList.append(Wire(direction=port.wireDirection,
+                                                 source=f"{sourceName}{i}",
+                                                 xOffset=value,
+                                                 yOffset=port.yOffset,
+                                                 destination=f"{destName}{i}"))
 
                         value = min(max(port.yOffset, -1), 1)
                         for i in range(port.wireCount*abs(port.yOffset)):
-                            tile.wireList.append(Wire(direction=port.wireDirection,
-                                                      source=f"{sourceName}{i}",
-                                                      xOffset=port.xOffset,
-                                                      yOffset=value,
-                                                      destination=f"{destName}{i}",
-                                                      sourceTile=f"X{x}Y{y}",
-                                                      destinationTile=f"X{x+port.xOffset}Y{y+value}"))
-                tile.wireList = list(dict.fromkeys(tile.wireList))
+                            wireList.append(Wire(direction=port.wireDirection,
+                                                 source=f"{sourceName}{i}",
+                                                 xOffset=port.xOffset,
+                                                 yOffset=value,
+                                                 destination=f"{destName}{i}"))
+                tile.wireList = wireTemplates[tile.name] = list(
+                    dict.fromkeys(wireList))
+
+        for name, wireList in wireTemplates.items():
+            if name in self.tileDic:
+                self.tileDic[name].wireList = wireList
 
     def __repr__(self) -> str:
         fabric = ""
@@ -597,3 +729,254 @@ class Fabric():
 
     def getSuperTileByName(self, name: str) -> SuperTile:
         return self.superTileDic[name]
+
+    def getWireDatabase(self) -> "WireDatabase":
+        if self.wireDatabase is None:
+            self.wireDatabase = WireDatabase(self)
+        return self.wireDatabase
+
+    def getTileByCoords(self, x: int, y: int) -> Tile:
+        """
+        Returns:
+            Tile: The tile at (x, y), None for a NULL tile or a location outside the fabric
+        """
+        if 0 <= y < len(self.tile) and 0 <= x < len(self.tile[y]):
+            return self.tile[y][x]
+        return None
+
+    def getTileByLoc(self, loc: str) -> Tile:
+        """
+        Returns:
+            Tile: The tile at a location of the form "X{x}Y{y}", None for a NULL tile or a location outside the fabric
+        """
+        if m := LOCATION_RE.fullmatch(loc):
+            return self.getTileByCoords(int(m.group(1)), int(m.group(2)))
+        return None
+
+    def getWireByDestination(self, loc: str, destination: str, jumps: bool = True) -> Tuple[int, int, Wire]:
+        """
+        Find the wire ending in the given port of the tile at loc through the destination index of the wire database.
+        If several wires end there, the wire of the first source tile in row-major order is returned.
+
+        Args:
+            loc (str): The location of the destination tile, of the form "X{x}Y{y}"
+            destination (str): The destination name of the wire, e.g. "N1END0"
+            jumps (bool, optional): Whether JUMP wires are considered. Defaults to True.
+
+        Returns:
+            Tuple[int, int, Wire]: The X and Y coordinate of the source tile and the wire, None if no wire ends there
+        """
+        m = LOCATION_RE.fullmatch(loc)
+        if m is None:
+            return None
+        found = self.getWireDatabase().findWireByDestination(int(m.group(1)), int(m.group(2)), destination, jumps)
+        if found is None:
+            return None
+        x, y, i = found
+        return x, y, self.tile[y][x].wireList[i]
+
+    def getNeighbours(self, x: int, y: int, distance: int = 1) -> List[Tuple[int, int, Tile]]:
+        """
+        Returns:
+            List[Tuple[int, int, Tile]]: The X and Y coordinate and the tile of all the tiles at most distance tiles away
+            from (x, y) in both directions, without the tile itself and NULL tiles, in row-major order
+        """
+        neighbours = []
+        for j in range(max(y - distance, 0), min(y + distance + 1, len(self.tile))):
+            row = self.tile[j]
+            for i in range(max(x - distance, 0), min(x + distance + 1, len(row))):
+                if (i, j) != (x, y) and row[i] is not None:
+                    neighbours.append((i, j, row[i]))
+        return neighbours
+
+
+# the location of a tile, e.g. X1Y2
+LOCATION_RE = re.compile(r"X(\d+)Y(\d+)")
+
+
+@dataclass(frozen=True)
+class WireColumns():
+    """
+    The columns of a set of wires of a `WireDatabase`, one entry per wire. The source and destination of a wire are
+    indices into `WireDatabase.names` and its direction is an index into `WireDatabase.directions`.
+
+    Attributes:
+        sourceX (numpy.ndarray) : The X coordinate of the tile the wire starts in
+        sourceY (numpy.ndarray) : The Y coordinate of the tile the wire starts in
+        destinationX (numpy.ndarray) : The X coordinate of the tile the wire ends in
+        destinationY (numpy.ndarray) : The Y coordinate of the tile the wire ends in
+        source (numpy.ndarray) : The name index of the source of the wire
+        destination (numpy.ndarray) : The name index of the destination of the wire
+        direction (numpy.ndarray) : The direction index of the wire
+        xOffset (numpy.ndarray) : The X-offset of the wire
+        yOffset (numpy.ndarray) : The Y-offset of the wire
+    """
+    sourceX: numpy.ndarray
+    sourceY: numpy.ndarray
+    destinationX: numpy.ndarray
+    destinationY: numpy.ndarray
+    source: numpy.ndarray
+    destination: numpy.ndarray
+    direction: numpy.ndarray
+    xOffset: numpy.ndarray
+    yOffset: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+
+class WireDatabase():
+    """
+    The wires of a whole fabric with interned names and one NumPy array per attribute. The wires of a tile type are
+    stored once, as `Fabric.__post_init__` generates them, and every placed tile refers to them by its tile type. The
+    wires of tile type t are entries typePtr[t] to typePtr[t+1] of the type columns.
+
+    Attributes:
+        names (Tuple[str, ...]) : The interned source and destination names of all wires
+        nameIndex (Dict[str, int]) : The index of each name in names
+        directions (Tuple[Direction, ...]) : The directions a direction index refers to
+        tileTypes (Tuple[str, ...]) : The name of each tile type with wires in the fabric
+        typeIndex (Dict[str, int]) : The index of each tile type in tileTypes
+        typePtr (numpy.ndarray) : The start of the wires of each tile type, plus the end of the last one
+        source (numpy.ndarray) : The name index of the source of each wire of all tile types
+        destination (numpy.ndarray) : The name index of the destination of each wire of all tile types
+        direction (numpy.ndarray) : The direction index of each wire of all tile types
+        xOffset (numpy.ndarray) : The X-offset of each wire of all tile types
+        yOffset (numpy.ndarray) : The Y-offset of each wire of all tile types
+        tileX (numpy.ndarray) : The X coordinate of each placed tile, in row-major order
+        tileY (numpy.ndarray) : The Y coordinate of each placed tile, in row-major order
+        tileType (numpy.ndarray) : The tile type index of each placed tile, in row-major order
+        tileOfLocation (Dict[Tuple[int, int], int]) : The placed tile index of each (x, y) location with a tile
+        destinationIndex (Dict[int, List[Tuple[int, int, int, int, bool]]]) : For each name index, the tile type,
+            wire index, X-offset and Y-offset of the wires ending in that name and whether they are JUMP wires
+    """
+
+    def __init__(self, fabric: Fabric) -> None:
+        self.nameIndex: Dict[str, int] = {}
+        self.directions = tuple(Direction)
+        directionIndex = {d: i for i, d in enumerate(self.directions)}
+        self.typeIndex: Dict[str, int] = {}
+        typePtr = [0]
+        source, destination, direction, xOffset, yOffset = [], [], [], [], []
+        tileX, tileY, tileType = [], [], []
+        for y, row in enumerate(fabric.tile):
+            for x, tile in enumerate(row):
+                if tile is None:
+                    continue
+                if tile.name not in self.typeIndex:
+                    self.typeIndex[tile.name] = len(self.typeIndex)
+                    for wire in tile.wireList:
+                        source.append(self.nameIndex.setdefault(wire.source, len(self.nameIndex)))
+                        destination.append(self.nameIndex.setdefault(wire.destination, len(self.nameIndex)))
+                        direction.append(directionIndex[wire.direction])
+                        xOffset.append(wire.xOffset)
+                        yOffset.append(wire.yOffset)
+                    typePtr.append(len(source))
+                tileX.append(x)
+                tileY.append(y)
+                tileType.append(self.typeIndex[tile.name])
+
+        self.names = tuple(self.nameIndex)
+        self.tileTypes = tuple(self.typeIndex)
+        self.typePtr = numpy.array(typePtr, dtype=numpy.int64)
+        self.source = numpy.array(source, dtype=numpy.int32)
+        self.destination = numpy.array(destination, dtype=numpy.int32)
+        self.direction = numpy.array(direction, dtype=numpy.int8)
+        self.xOffset = numpy.array(xOffset, dtype=numpy.int32)
+        self.yOffset = numpy.array(yOffset, dtype=numpy.int32)
+        self.tileX = numpy.array(tileX, dtype=numpy.int32)
+        self.tileY = numpy.array(tileY, dtype=numpy.int32)
+        self.tileType = numpy.array(tileType, dtype=numpy.int32)
+        self.tileOfLocation = {(x, y): i for i, (x, y) in enumerate(zip(tileX, tileY))}
+        self.destinationIndex: Dict[int, List[Tuple[int, int, int, int, bool]]] = {}
+        for t in range(len(self.tileTypes)):
+            for w in range(typePtr[t], typePtr[t+1]):
+                self.destinationIndex.setdefault(destination[w], []).append(
+                    (t, w, xOffset[w], yOffset[w], self.directions[direction[w]] == Direction.JUMP))
+
+    def getTypeSlice(self, name: str) -> slice:
+        t = self.typeIndex[name]
+        return slice(int(self.typePtr[t]), int(self.typePtr[t+1]))
+
+    def findWireByDestination(self, x: int, y: int, destination: str, jumps: bool = True) -> Tuple[int, int, int]:
+        """
+        Find the first wire, in row-major order of the source tiles, that ends in the given port of the tile at (x, y).
+        Only the wires of the destinationIndex entry of the port are checked.
+
+        Args:
+            x (int): X coordinate of the destination tile
+            y (int): Y coordinate of the destination tile
+            destination (str): The destination name of the wire
+            jumps (bool, optional): Whether JUMP wires are considered. Defaults to True.
+
+        Returns:
+            Tuple[int, int, int]: The X and Y coordinate of the source tile and the index of the wire in its wire list,
+            None if no wire ends there
+        """
+        best = None
+        for t, w, xOffset, yOffset, isJump in self.destinationIndex.get(self.nameIndex.get(destination), ()):
+            if isJump and not jumps:
+                continue
+            sourceX, sourceY = x - xOffset, y - yOffset
+            i = self.tileOfLocation.get((sourceX, sourceY))
+            if i is None or self.tileType[i] != t:
+                continue
+            if best is None or (sourceY, sourceX, w) < best[:3]:
+                best = (sourceY, sourceX, w, t)
+        if best is None:
+            return None
+        sourceY, sourceX, w, t = best
+        return sourceX, sourceY, w - int(self.typePtr[t])
+
+    def getTileWires(self, x: int, y: int) -> WireColumns:
+        """
+        Returns the wires starting in the tile at (x, y). The name, direction and offset columns are views into the
+        tile type columns and the source coordinates are broadcast views, so no wire data is copied.
+
+        Args:
+            x (int): X coordinate of the tile
+            y (int): Y coordinate of the tile
+
+        Returns:
+            WireColumns: The wires of the tile
+        """
+        t = int(self.tileType[self.tileOfLocation[(x, y)]])
+        wires = slice(int(self.typePtr[t]), int(self.typePtr[t+1]))
+        xOffset = self.xOffset[wires]
+        yOffset = self.yOffset[wires]
+        return WireColumns(sourceX=numpy.broadcast_to(numpy.int32(x), xOffset.shape),
+                           sourceY=numpy.broadcast_to(numpy.int32(y), yOffset.shape),
+                           destinationX=xOffset + x,
+                           destinationY=yOffset + y,
+                           source=self.source[wires],
+                           destination=self.destination[wires],
+                           direction=self.direction[wires],
+                           xOffset=xOffset,
+                           yOffset=yOffset)
+
+    def getAllWires(self) -> WireColumns:
+        """
+        Returns the wires of all placed tiles, in row-major order of their source tile. The columns are gathered from
+        the tile type columns in one vectorized step.
+
+        Returns:
+            WireColumns: The wires of the fabric
+        """
+        counts = numpy.diff(self.typePtr)[self.tileType]
+        starts = self.typePtr[:-1][self.tileType]
+        # index into the tile type columns of every placed wire
+        offsets = numpy.cumsum(counts) - counts
+        gather = numpy.arange(counts.sum(), dtype=numpy.int64) + numpy.repeat(starts - offsets, counts)
+        sourceX = numpy.repeat(self.tileX, counts)
+        sourceY = numpy.repeat(self.tileY, counts)
+        xOffset = self.xOffset[gather]
+        yOffset = self.yOffset[gather]
+        return WireColumns(sourceX=sourceX,
+                           sourceY=sourceY,
+                           destinationX=sourceX + xOffset,
+                           destinationY=sourceY + yOffset,
+                           source=self.source[gather],
+                           destination=self.destination[gather],
+                           direction=self.direction[gather],
+                           xOffset=xOffset,
+                           yOffset=yOffset)
@@ -26,12 +26,9 @@ import logging
 from pathlib import Path
 
 
-from fasm import *  # Remove this line if you do not have the fasm library installed and will not be generating a bitstream
-
-
-from fabric_generator.file_parser import parseMatrix, parseConfigMem, parseList
+from fabric_generator.file_parser import parseConfigMem, parseList, configMemEncoding, getSwitchMatrix
 from fabric_generator.fabric import IO, Direction, MultiplexerStyle, ConfigBitMode
-from fabric_generator.fabric import Fabric, Tile, Port, SuperTile, ConfigMem
+from fabric_generator.fabric import Fabric, Tile, Port, SuperTile, ConfigMem, ConfigMemEncoding
 from fabric_generator.code_generation_VHDL import VHDLWriter
 from fabric_generator.code_generation_Verilog import VerilogWriter
 from fabric_generator.code_generator import codeGenerator
@@ -49,14 +46,38 @@ class FabricGenerator:
     Attributes:
         fabric (Fabric): The parsed fabric object from CSV definition files
         writer (codeGenerator): The code generator object to write the RTL files
+        configMemEncodings (Dict[Tuple[str, float], ConfigMemEncoding]): The config memory encodings computed so far,
+            keyed by the config memory csv file and its modification time
 
     """
     fabric: Fabric
     writer: codeGenerator
+    configMemEncodings: Dict[Tuple[str, float], ConfigMemEncoding]
 
     def __init__(self, fabric: Fabric, writer: codeGenerator) -> None:
         self.fabric = fabric
         self.writer = writer
+        self.configMemEncodings = {}
+
+    def getConfigMemEncoding(self, tile: Tile, configMemCsv: str) -> ConfigMemEncoding:
+        """
+        Returns the encoding between the config bits and the frame bits of the given tile. The config memory csv file
+        is only parsed again when it has changed.
+
+        Args:
+            tile (Tile): A tile object
+            configMemCsv (str): The directory of the config memory csv file
+
+        Returns:
+            ConfigMemEncoding: The encoding of the config memory of the tile
+        """
+        key = (os.path.abspath(configMemCsv), os.path.getmtime(configMemCsv))
+        if key not in self.configMemEncodings:
+            configMemList = parseConfigMem(
+                configMemCsv, self.fabric.maxFramesPerCol, self.fabric.frameBitsPerRow, tile.globalConfigBits)
+            self.configMemEncodings[key] = configMemEncoding(
+                configMemList, self.fabric.maxFramesPerCol, self.fabric.frameBitsPerRow)
+        return self.configMemEncodings[key]
 
     @staticmethod
     def bootstrapSwitchMatrix(tile: Tile, outputDir: str) -> None:
@@ -287,21 +308,17 @@ class FabricGenerator:
 
         # test if we have a bitstream mapping file
         # if not, we will take the default, which was passed on from  GenerateConfigMemInit
-        configMemList: List[ConfigMem] = []
         if os.path.exists(configMemCsv):
             logger.info(
                 f"Found bitstream mapping file {tile.name}_configMem.csv for tile {tile.name}")
-            logger.info(f"Parsing {tile.name}_configMem.csv")
-            configMemList = parseConfigMem(
-                configMemCsv, self.fabric.maxFramesPerCol, self.fabric.frameBitsPerRow, tile.globalConfigBits)
         else:
             logger.info(f"{tile.name}_configMem.csv does not exist")
             logger.info(f"Generating a default configMem for {tile.name}")
             self.generateConfigMemInit(
                 configMemCsv, tile.globalConfigBits)
-            logger.info(f"Parsing {tile.name}_configMem.csv")
-            configMemList = parseConfigMem(
-                configMemCsv, self.fabric.maxFramesPerCol, self.fabric.frameBitsPerRow, tile.globalConfigBits)
+        logger.info(f"Parsing {tile.name}_configMem.csv")
+        encoding = self.getConfigMemEncoding(tile, configMemCsv)
+        configMemList = encoding.configMems
 
         # start writing the file
         self.writer.addHeader(f"{tile.name}_ConfigMem")
@@ -347,29 +364,27 @@ class FabricGenerator:
         if isinstance(self.writer, VerilogWriter): # emulation only in Verilog
             self.writer.addPreprocIfDef("EMULATION")
             for i in configMemList:
-                counter = 0
                 for k in range(self.fabric.frameBitsPerRow):
                     if i.usedBitMask[k] == "1":
-                        self.writer.addAssignScalar(f"ConfigBits[{i.configBitRanges[counter]}]",
-                            f"Emulate_Bitstream[{i.frameIndex*self.fabric.frameBitsPerRow + (self.fabric.frameBitsPerRow-1-k)}]")
-                        counter += 1
+                        frameBit = i.frameIndex*self.fabric.frameBitsPerRow + (self.fabric.frameBitsPerRow-1-k)
+                        self.writer.addAssignScalar(f"ConfigBits[{encoding.frameBitToConfigBit[frameBit]}]",
+                            f"Emulate_Bitstream[{frameBit}]")
             self.writer.addPreprocElse()
         self.writer.addNewLine()
         self.writer.addNewLine()
         self.writer.addComment("instantiate frame latches", end="")
         for i in configMemList:
-            counter = 0
             for k in range(self.fabric.frameBitsPerRow):
                 if i.usedBitMask[k] == "1":
+                    configBit = encoding.frameBitToConfigBit[i.frameIndex*self.fabric.frameBitsPerRow + (self.fabric.frameBitsPerRow-1-k)]
                     self.writer.addInstantiation(compName="LHQD1",
                                                  compInsName=f"Inst_{i.frameName}_bit{self.fabric.frameBitsPerRow-1-k}",
                                                  portsPairs=[("D", f"FrameData[{self.fabric.frameBitsPerRow-1-k}]"),
                                                              ("E",
                                                               f"FrameStrobe[{i.frameIndex}]"),
-                                                             ("Q", f"ConfigBits[{i.configBitRanges[counter]}]"),
-                                                             ("QN", f"ConfigBits_N[{i.configBitRanges[counter]}]")]
+                                                             ("Q", f"ConfigBits[{configBit}]"),
+                                                             ("QN", f"ConfigBits_N[{configBit}]")]
                                                  )
-                    counter += 1
         if isinstance(self.writer, VerilogWriter): # emulation only in Verilog
             self.writer.addPreprocEndif()
         self.writer.addDesignDescriptionEnd()
@@ -393,7 +408,7 @@ class FabricGenerator:
         # convert the matrix to a dictionary map and performs entry check
         connections: Dict[str, List[str]] = {}
         if tile.matrixDir.endswith(".csv"):
-            connections = parseMatrix(tile.matrixDir, tile.name)
+            switchMatrix = getSwitchMatrix(tile)
         elif tile.matrixDir.endswith(".list"):
             logger.info(f"{tile.name} matrix is a list file")
             logger.info(
@@ -404,7 +419,7 @@ class FabricGenerator:
             logger.info(
                 f"Update matrix directory to {matrixDir} for Fabric Tile Dictionary")
             tile.matrixDir = matrixDir
-            connections = parseMatrix(tile.matrixDir, tile.name)
+            switchMatrix = getSwitchMatrix(tile)
         elif tile.matrixDir.endswith(".v") or tile.matrixDir.endswith(".vhdl"):
             logger.info(
                 f"A switch matrix file is provided in {tile.name}, will skip the matrix generation process")
@@ -412,9 +427,8 @@ class FabricGenerator:
         else:
             raise ValueError("Invalid matrix file format")
 
-        noConfigBits = 0
-        for i in connections:
-            noConfigBits += len(connections[i]).bit_length()-1
+        connections = switchMatrix.getConnections()
+        noConfigBits = switchMatrix.noConfigBits
 
         # we pass the NumberOfConfigBits as a comment in the beginning of the file.
         # This simplifies it to generate the configuration port only if needed later when building the fabric where we are only working with the VHDL files
@@ -1958,17 +1972,24 @@ class FabricGenerator:
         """
         Generate the bits stream specification of the fabric. This is need and will be further parsed by the bit_gen.py
 
+        The feature map of a tile only depends on its tile type, so one template is generated per tile type and stored
+        in `TileTypeSpecs`. The `TileMap` maps each tile location to its tile type, through which the bitstream
+        generation resolves the features of each tile.
+
         Returns:
             dict[str, dict]: The bits stream specification of the fabric
         """
 
         specData = {"TileMap": {},
-                    "TileSpecs": {},
-                    "TileSpecs_No_Mask": {},
+                    "TileTypeSpecs": {},
+                    "TileTypeSpecs_No_Mask": {},
                     "FrameMap": {},
                     "FrameMapEncode": {},
                     "ArchSpecs": {"MaxFramesPerCol": self.fabric.maxFramesPerCol,
-                                  "FrameBitsPerRow": self.fabric.frameBitsPerRow}}
+                                  "FrameBitsPerRow": self.fabric.frameBitsPerRow,
+                                  "FrameSelectWidth": self.fabric.frameSelectWidth,
+                                  "RowSelectWidth": self.fabric.rowSelectWidth,
+                                  "DesyncFlag": self.fabric.desync_flag}}
 
         tileMap = {}
         for y, row in enumerate(self.fabric.tile):
@@ -1979,91 +2000,108 @@ class FabricGenerator:
                     tileMap[f"X{x}Y{y}"] = "NULL"
 
         specData["TileMap"] = tileMap
-        configMemList: List[ConfigMem] = []
         for y, row in enumerate(self.fabric.tile):
             for x, tile in enumerate(row):
                 if tile == None:
                     continue
-                if os.path.exists(f"{tile.filePath}/{tile.name}_ConfigMem.csv"):
-                    configMemList = parseConfigMem(
-                        f"{tile.filePath}/{tile.name}_ConfigMem.csv", self.fabric.maxFramesPerCol, self.fabric.frameBitsPerRow, tile.globalConfigBits)
-                elif tile.globalConfigBits > 0:
-                    logger.error(
-                        f"No ConfigMem csv file found for {tile.name} which have config bits")
-                    exit(-1)
-
-                encodeDict = [-1] * (self.fabric.maxFramesPerCol *
-                                     self.fabric.frameBitsPerRow)
-                maskDic = {}
-                for cfm in configMemList:
-                    maskDic[cfm.frameIndex] = cfm.usedBitMask
-                    # matching the value in the configBitRanges with the reversedBitMask
-                    # bit 0 in bit mask is the first value in the configBitRanges
-                    for i, char in enumerate(cfm.usedBitMask):
-                        if char == "1":
-                            encodeDict[cfm.configBitRanges.pop(0)] = (
-                                self.fabric.frameBitsPerRow - 1 - i) + self.fabric.frameBitsPerRow * cfm.frameIndex
-
-                # filling the maskDic with the unused frames
-                for i in range(self.fabric.maxFramesPerCol-len(configMemList)):
-                    maskDic[len(configMemList)+i] = '0' * \
-                        self.fabric.frameBitsPerRow
-
-                specData["FrameMap"][tile.name] = maskDic
-                if tile.globalConfigBits == 0:
-                    logger.info(f"No config memory for X{x}Y{y}_{tile.name}.")
-                    specData["FrameMap"][tile.name] = {}
-                    specData["FrameMapEncode"][tile.name] = {}
-
-                curBitOffset = 0
-                curTileMap = {}
-                curTileMapNoMask = {}
-
-                for i, bel in enumerate(tile.bels):
-                    for featureKey, keyDict in bel.belFeatureMap.items():
-                        for entry in keyDict:
-                            if isinstance(entry, int):
-                                for v in keyDict[entry]:
-                                    curTileMap[f"{string.ascii_uppercase[i]}.{featureKey}"] = {
-                                        encodeDict[curBitOffset+v]: keyDict[entry][v]}
-                                    curTileMapNoMask[f"{string.ascii_uppercase[i]}.{featureKey}"] = {
-                                        encodeDict[curBitOffset+v]: keyDict[entry][v]}
-                                curBitOffset += len(keyDict[entry])
 
                 # All the generation will be working on the tile level with the tileDic
                 # This is added to propagate the updated switch matrix to each of the tile in the fabric
                 if tile.matrixDir.endswith(".list"):
                     tile.matrixDir = tile.matrixDir.replace(".list", ".csv")
 
-                result = parseMatrix(
-                    tile.matrixDir, tile.name)
-                for source, sinkList in result.items():
-                    controlWidth = 0
-                    for i, sink in enumerate(reversed(sinkList)):
-                        controlWidth = len(sinkList).bit_length()-1
-                        controlValue = f"{len(sinkList) - 1 - i:0{controlWidth}b}"
-                        pip = f"{sink}.{source}"
-                        if len(sinkList) < 2:
-                            curTileMap[pip] = {}
-                            curTileMapNoMask[pip] = {}
-                            continue
+                if tile.name in specData["TileTypeSpecs"]:
+                    continue
 
-                        for c, curChar in enumerate(controlValue[::-1]):
-                            if pip not in curTileMap.keys():
-                                curTileMap[pip] = {}
-                                curTileMapNoMask[pip] = {}
+                curTileMap, curTileMapNoMask = self.generateTileTypeSpec(tile, specData)
+                specData["TileTypeSpecs"][tile.name] = curTileMap
+                specData["TileTypeSpecs_No_Mask"][tile.name] = curTileMapNoMask
 
-                            curTileMap[pip][encodeDict[curBitOffset+c]] = curChar
-                            curTileMapNoMask[pip][encodeDict[curBitOffset+c]] = curChar
+        return specData
 
-                    curBitOffset += controlWidth
+    def generateTileTypeSpec(self, tile: Tile, specData: Dict[str, Dict]) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+        """
+        Generate the bitstream specification template of a tile type. The frame map of the tile type is added to
+        `specData` as well.
 
-                # And now we add empty config bit mappings for immutable connections (i.e. wires), as nextpnr sees these the same as normal pips
-                for wire in tile.wireList:
-                    curTileMap[f"{wire.source}.{wire.destination}"] = {}
-                    curTileMapNoMask[f"{wire.source}.{wire.destination}"] = {}
+        Args:
+            tile (Tile): A tile object of the tile type
+            specData (Dict[str, Dict]): The bitstream specification the frame map is added to
 
-                specData["TileSpecs"][f"X{x}Y{y}"] = curTileMap
-                specData["TileSpecs_No_Mask"][f"X{x}Y{y}"] = curTileMapNoMask
+        Returns:
+            Tuple[Dict[str, dict], Dict[str, dict]]: The feature to bit mapping of the tile type with and without mask
+        """
+        configMemList: Tuple[ConfigMem, ...] = ()
+        encodeDict = (-1,) * (self.fabric.maxFramesPerCol *
+                              self.fabric.frameBitsPerRow)
+        if os.path.exists(f"{tile.filePath}/{tile.name}_ConfigMem.csv"):
+            encoding = self.getConfigMemEncoding(tile, f"{tile.filePath}/{tile.name}_ConfigMem.csv")
+            configMemList = encoding.configMems
+            encodeDict = encoding.configBitToFrameBit
+        elif tile.globalConfigBits > 0:
+            logger.error(
+                f"No ConfigMem csv file found for {tile.name} which have config bits")
+            exit(-1)
+
+        maskDic = {}
+        for cfm in configMemList:
+            maskDic[cfm.frameIndex] = cfm.usedBitMask
+
+        # filling the maskDic with the unused frames
+        for i in range(self.fabric.maxFramesPerCol-len(configMemList)):
+            maskDic[len(configMemList)+i] = '0' * \
+                self.fabric.frameBitsPerRow
+
+        specData["FrameMap"][tile.name] = maskDic
+        specData["FrameMapEncode"][tile.name] = list(encodeDict[:tile.globalConfigBits])
+        if tile.globalConfigBits == 0:
+            logger.info(f"No config memory for {tile.name}.")
+            specData["FrameMap"][tile.name] = {}
+            specData["FrameMapEncode"][tile.name] = {}
+
+        curBitOffset = 0
+        curTileMap = {}
+        curTileMapNoMask = {}
+
+        for i, bel in enumerate(tile.bels):
+            for featureKey, keyDict in bel.belFeatureMap.items():
+                for entry in keyDict:
+                    if isinstance(entry, int):
+                        for v in keyDict[entry]:
+                            curTileMap[f"{string.ascii_uppercase[i]}.{featureKey}"] = {
+                                encodeDict[curBitOffset+v]: keyDict[entry][v]}
+                            curTileMapNoMask[f"{string.ascii_uppercase[i]}.{featureKey}"] = {
+                                encodeDict[curBitOffset+v]: keyDict[entry][v]}
+                        curBitOffset += len(keyDict[entry])
+
+        result = getSwitchMatrix(tile).getConnections()
+        for source, sinkList in result.items():
+            controlWidth = 0
+            for i, sink in enumerate(reversed(sinkList)):
+                controlWidth = len(sinkList).bit_length()-1
+                controlValue = f"{len(sinkList) - 1 - i:0{controlWidth}b}"
+                pip = f"{sink}.{source}"
+                if len(sinkList) < 2:
+                    curTileMap[pip] = {}
+                    curTileMapNoMask[pip] = {}
+                    continue
 
-        return specData
+                for c, curChar in enumerate(controlValue[::-1]):
+                    if pip not in curTileMap.keys():
+                        curTileMap[pip] = {}
+                        curTileMapNoMask[pip] = {}
+
+                    curTileMap[pip][encodeDict[curBitOffset+c]] = curChar
+                    curTileMapNoMask[pip][encodeDict[curBitOffset+c]] = curChar
+
+            curBitOffset += controlWidth
+
+        # And now we add empty config bit mappings for immutable connections (i.e. wires), as nextpnr sees these the same as normal pips
+        wireDatabase = self.fabric.getWireDatabase()
+        names = wireDatabase.names
+        wires = wireDatabase.getTypeSlice(tile.name)
+        for source, destination in zip(wireDatabase.source[wires].tolist(), wireDatabase.destination[wires].tolist()):
+            curTileMap[f"{names[source]}.{names[destination]}"] = {}
+            curTileMapNoMask[f"{names[source]}.{names[destination]}"] = {}
+
+        return curTileMap, curTileMapNoMask
@@ -1,11 +1,20 @@
 import re
 from copy import deepcopy
-from typing import Dict, List, Literal, Tuple, Union, overload
+from typing import Any, Dict, List, Literal, Tuple, Union, overload
+from concurrent.futures import ProcessPoolExecutor
 import csv
 import os
+import sys
+import hashlib
+import pickle
+import numpy
 
-from fabric_generator.fabric import Fabric, Port, Bel, Tile, SuperTile, ConfigMem
+from fabric_generator.fabric import Fabric, Port, Bel, Tile, SuperTile, ConfigMem, ConfigMemEncoding, SwitchMatrix
 from fabric_generator.fabric import IO, Direction, Side, MultiplexerStyle, ConfigBitMode
+from fabric_generator.utilities import processPoolContext
+
+# The source files whose code determines the parse results, part of the bel cache key and of the fabric snapshot
+PARSER_SOURCES = (__file__, sys.modules[Fabric.__module__].__file__)
 
 # from fabric import Fabric, Port, Bel, Tile, SuperTile, ConfigMem
 # from fabric import IO, Direction, Side, MultiplexerStyle, ConfigBitMode
@@ -15,12 +24,16 @@ oppositeDic = {"NORTH": "SOUTH", "SOUTH": "NORTH",
                "EAST": "WEST", "WEST": "EAST"}
 
 
-def parseFabricCSV(fileName: str) -> Fabric:
+def parseFabricCSV(fileName: str, processes: int = None) -> Fabric:
     """
-    Pares a csv file and returns a fabric object.
+    Pares a csv file and returns a fabric object. If the csv file is in a FABulous project, the parsed bel files are
+    cached in the `.FABulous/belCache` directory of the project. The bel and matrix files are parsed before the tiles
+    are assembled, in a process pool if `processes` is given or the fabric has many files.
 
     Args:
         fileName (str): the directory of the csv file.
+        processes (int, optional): The number of processes parsing the bel and matrix files. Defaults to None, which
+            parses in this process unless there are at least PARALLEL_PARSE_JOBS files, then all cores are used.
 
     Raises:
         ValueError: File provide need to be a csv file.
@@ -46,6 +59,9 @@ def parseFabricCSV(fileName: str) -> Fabric:
         raise ValueError(f"File {fileName} does not exist")
 
     filePath, _ = os.path.split(os.path.abspath(fileName))
+    belCacheDir = None
+    if os.path.isdir(os.path.join(filePath, ".FABulous")):
+        belCacheDir = os.path.join(filePath, ".FABulous", "belCache")
 
     with open(fileName, 'r') as f:
         file = f.read()
@@ -72,6 +88,26 @@ def parseFabricCSV(fileName: str) -> Fabric:
     superTile = re.findall(r"SuperTILE(.*?)EndSuperTILE",
                            file, re.MULTILINE | re.DOTALL)
 
+    # the bel and matrix files are independent of each other, so they are all parsed up front
+    fileJobs = []
+    for t in tilesData:
+        t = t.split("\n")
+        tileName = t[0].split(",")[1]
+        for item in t:
+            temp = item.split(",")
+            if temp[0] == "BEL" and temp[1].endswith((".vhdl", ".v")):
+                fileJobs.append(("BEL", os.path.join(filePath, temp[1]), temp[2],
+                                 "vhdl" if temp[1].endswith(".vhdl") else "verilog", belCacheDir))
+            elif temp[0] == "MATRIX" and temp[1].endswith((".list", "_matrix.csv", ".vhdl", ".v")):
+                fileJobs.append(("MATRIX", os.path.join(filePath, temp[1]), tileName))
+    for t in superTile:
+        for i in t.split("\n")[1:-1]:
+            line = [j for j in i.split(",") if j != "" and j != " "]
+            if line and line[0] == "BEL":
+                fileJobs.append(("BEL", os.path.join(filePath, line[1]), line[2],
+                                 "vhdl" if line[0].endswith("VHDL") else "verilog", belCacheDir))
+    fileResults = _parseFiles(fileJobs, processes)
+
     # parse the tile description
     fabricDescription = fabricDescription.split("\n")
     parameters = parameters.split("\n")
@@ -111,9 +147,9 @@ def parseFabricCSV(fileName: str) -> Fabric:
             elif temp[0] == "BEL":
                 belFilePath = os.path.join(filePath, temp[1])
                 if temp[1].endswith(".vhdl"):
-                    result = parseFileVHDL(belFilePath, temp[2])
+                    result = fileResults[("BEL", belFilePath, temp[2], "vhdl", belCacheDir)]
                 elif temp[1].endswith(".v"):
-                    result = parseFileVerilog(belFilePath, temp[2])
+                    result = fileResults[("BEL", belFilePath, temp[2], "verilog", belCacheDir)]
                 else:
                     raise ValueError(
                         "Invalid file type, only .vhdl and .v are supported")
@@ -124,26 +160,8 @@ def parseFabricCSV(fileName: str) -> Fabric:
             elif temp[0] == "MATRIX":
                 matrixDir = os.path.join(filePath, temp[1])
                 configBit = 0
-                if temp[1].endswith(".list"):
-                    for _, v in parseList(matrixDir, "source").items():
-                        muxSize = len(v)
-                        if muxSize >= 2:
-                            configBit += muxSize.bit_length()-1
-                elif temp[1].endswith("_matrix.csv"):
-                    for _, v in parseMatrix(matrixDir, tileName).items():
-                        muxSize = len(v)
-                        if muxSize >= 2:
-                            configBit += muxSize.bit_length()-1
-                elif temp[1].endswith(".vhdl") or temp[1].endswith(".v"):
-                    with open(matrixDir, "r") as f:
-                        f = f.read()
-                        if configBit := re.search(r"NumberOfConfigBits: (\d+)", f):
-                            configBit = int(configBit.group(1))
-                        else:
-                            configBit = 0
-                            print(
-                                f"Cannot find NumberOfConfigBits in {matrixDir} assume 0 config bits")
-
+                if temp[1].endswith((".list", "_matrix.csv", ".vhdl", ".v")):
+                    configBit = fileResults[("MATRIX", matrixDir, tileName)]
                 else:
                     raise ValueError(
                         'Unknown file extension for matrix')
@@ -174,9 +192,9 @@ def parseFabricCSV(fileName: str) -> Fabric:
             if line[0] == "BEL":
                 belFilePath = os.path.join(filePath, line[1])
                 if line[0].endswith("VHDL"):
-                    result = parseFileVHDL(belFilePath, line[2])
+                    result = fileResults[("BEL", belFilePath, line[2], "vhdl", belCacheDir)]
                 else:
-                    result = parseFileVerilog(belFilePath, line[2])
+                    result = fileResults[("BEL", belFilePath, line[2], "verilog", belCacheDir)]
                 internal, external, config, shared, configBit, userClk, belMap = result
                 bels.append(Bel(belFilePath, line[2], internal,
                             external, config, shared, configBit, belMap, userClk))
@@ -235,6 +253,8 @@ def parseFabricCSV(fileName: str) -> Fabric:
     configBitMode = ConfigBitMode.FRAME_BASED
     frameBitsPerRow = 32
     maxFramesPerCol = 20
+    frameSelectWidth = 5
+    rowSelectWidth = 5
     package = "use work.my_package.all;"
     generateDelayInSwitchMatrix = 80
     multiplexerStyle = MultiplexerStyle.CUSTOM
@@ -257,6 +277,10 @@ def parseFabricCSV(fileName: str) -> Fabric:
             frameBitsPerRow = int(i[1])
         elif i[0].startswith("MaxFramesPerCol"):
             maxFramesPerCol = int(i[1])
+        elif i[0].startswith("FrameSelectWidth"):
+            frameSelectWidth = int(i[1])
+        elif i[0].startswith("RowSelectWidth"):
+            rowSelectWidth = int(i[1])
         elif i[0].startswith("Package"):
             package = i[1]
         elif i[0].startswith("GenerateDelayInSwitchMatrix"):
@@ -287,6 +311,8 @@ def parseFabricCSV(fileName: str) -> Fabric:
                   configBitMode=configBitMode,
                   frameBitsPerRow=frameBitsPerRow,
                   maxFramesPerCol=maxFramesPerCol,
+                  frameSelectWidth=frameSelectWidth,
+                  rowSelectWidth=rowSelectWidth,
                   package=package,
                   generateDelayInSwitchMatrix=generateDelayInSwitchMatrix,
                   multiplexerStyle=multiplexerStyle,
@@ -297,6 +323,148 @@ def parseFabricCSV(fileName: str) -> Fabric:
                   commonWirePair=commonWirePair)
 
 
+def _matrixConfigBits(matrixDir: str, tileName: str) -> int:
+    """
+    Count the configuration bits of a switch matrix file.
+
+    Args:
+        matrixDir (str): The directory of the matrix file, either a .list, a _matrix.csv or a .v/.vhdl file
+        tileName (str): The name of the tile the matrix belongs to
+
+    Returns:
+        int: The number of configuration bits of the switch matrix
+    """
+    configBit = 0
+    if matrixDir.endswith(".list"):
+        for _, v in parseList(matrixDir, "source").items():
+            muxSize = len(v)
+            if muxSize >= 2:
+                configBit += muxSize.bit_length()-1
+    elif matrixDir.endswith("_matrix.csv"):
+        configBit = parseSwitchMatrix(matrixDir, tileName).noConfigBits
+    else:
+        with open(matrixDir, "r") as f:
+            f = f.read()
+            if configBit := re.search(r"NumberOfConfigBits: (\d+)", f):
+                configBit = int(configBit.group(1))
+            else:
+                configBit = 0
+                print(
+                    f"Cannot find NumberOfConfigBits in {matrixDir} assume 0 config bits")
+    return configBit
+
+
+def _parseFile(job: tuple):
+    if job[0] == "BEL":
+        return parseBelFile(*job[1:])
+    return _matrixConfigBits(*job[1:])
+
+
+# number of distinct files from which parseFabricCSV uses a process pool by default
+PARALLEL_PARSE_JOBS = 64
+
+
+def _parseFiles(jobs: List[tuple], processes: int = None) -> Dict[tuple, Any]:
+    """
+    Parse bel files (`("BEL", filename, belPrefix, syntax, cacheDir)`) and matrix files (`("MATRIX", matrixDir,
+    tileName)`), in a process pool if there is more than one process. Each distinct file is parsed once. Errors are
+    raised in the order of the jobs, as if the files were parsed one after another.
+
+    Args:
+        jobs (List[tuple]): The files to parse
+        processes (int, optional): The number of processes. Defaults to None, which parses in this process if there
+            are fewer than PARALLEL_PARSE_JOBS files and uses all cores otherwise.
+
+    Returns:
+        Dict[tuple, Any]: The result of each job
+    """
+    jobs = list(dict.fromkeys(jobs))
+    if processes is None:
+        # starting a pool costs more than parsing a few files
+        processes = (os.cpu_count() or 1) if len(jobs) >= PARALLEL_PARSE_JOBS else 1
+    processes = min(processes, len(jobs))
+    if processes <= 1:
+        return {job: _parseFile(job) for job in jobs}
+    with ProcessPoolExecutor(processes, mp_context=processPoolContext()) as executor:
+        return dict(zip(jobs, executor.map(_parseFile, jobs)))
+
+
+# Bump whenever the content of a parsed Fabric changes without a change to the files listed by fabricInputFiles
+FABRIC_SNAPSHOT_VERSION = 1
+
+
+def fabricInputFiles(fileName: str, fabric: Fabric) -> List[str]:
+    """
+    List all the files a fabric is built from: the csv file, the bel and matrix files of its tiles and the source of
+    the parser itself.
+
+    Args:
+        fileName (str): the directory of the csv file.
+        fabric (Fabric): The fabric parsed from the csv file.
+
+    Returns:
+        List[str]: The absolute paths of the input files.
+    """
+    files = [fileName, *PARSER_SOURCES]
+    tiles = list(fabric.tileDic.values())
+    for superTile in fabric.superTileDic.values():
+        tiles += superTile.tiles
+        files += [bel.src for bel in superTile.bels]
+    for tile in tiles:
+        files += [bel.src for bel in tile.bels]
+        if tile.matrixDir:
+            files.append(tile.matrixDir)
+    return list(dict.fromkeys(os.path.abspath(f) for f in files))
+
+
+def _fileSignature(fileName: str, previous: Tuple[int, int, str] = None) -> Tuple[int, int, str]:
+    # a file with unchanged modification time and size is not hashed again
+    stat = os.stat(fileName)
+    if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+        return previous
+    with open(fileName, "rb") as f:
+        return stat.st_mtime_ns, stat.st_size, hashlib.sha256(f.read()).hexdigest()
+
+
+def loadFabricCSV(fileName: str, processes: int = None) -> Fabric:
+    """
+    Returns the fabric of a csv file like `parseFabricCSV`. If the csv file is in a FABulous project, the fabric is
+    stored as a snapshot in the `.FABulous` directory of the project together with the modification time, size and hash
+    of all its input files. As long as none of the input files changed in content, the fabric is loaded from the
+    snapshot instead of being parsed again.
+
+    Args:
+        fileName (str): the directory of the csv file.
+        processes (int, optional): The number of processes parsing the bel and matrix files. Defaults to None, see
+            `parseFabricCSV`.
+
+    Returns:
+        Fabric: The fabric object.
+    """
+    metaDataDir = os.path.join(os.path.dirname(os.path.abspath(fileName)), ".FABulous")
+    if not os.path.isdir(metaDataDir) or not os.path.exists(fileName):
+        return parseFabricCSV(fileName, processes)
+    snapshotFile = os.path.join(metaDataDir, "fabricSnapshot.pkl")
+
+    if os.path.exists(snapshotFile):
+        try:
+            with open(snapshotFile, "rb") as f:
+                version, csvFile, signatures, fabric = pickle.load(f)
+            if (version == FABRIC_SNAPSHOT_VERSION and csvFile == os.path.abspath(fileName)
+                    and all(_fileSignature(i, sig)[2] == sig[2] for i, sig in signatures.items())):
+                return fabric
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, TypeError):
+            pass
+
+    fabric = parseFabricCSV(fileName, processes)
+    signatures = {i: _fileSignature(i) for i in fabricInputFiles(fileName, fabric)}
+    # write to a temporary file first, so a concurrent load never reads a partial snapshot
+    with open(f"{snapshotFile}.{os.getpid()}", "wb") as f:
+        pickle.dump((FABRIC_SNAPSHOT_VERSION, os.path.abspath(fileName), signatures, fabric), f)
+    os.replace(f"{snapshotFile}.{os.getpid()}", snapshotFile)
+    return fabric
+
+
 @overload
 def parseList(fileName: str, collect: Literal["pair"] = "pair") -> List[Tuple[str, str]]:
     pass
@@ -395,6 +563,67 @@ def _expandListPorts(port, PortList):
     return
 
 
+_parserSourceDigest = None
+
+
+def _parserDigest() -> bytes:
+    # the parser code is part of the bel cache key, so an edited parser never serves the results of the old code
+    global _parserSourceDigest
+    if _parserSourceDigest is None:
+        digest = hashlib.sha256()
+        for source in PARSER_SOURCES:
+            with open(source, "rb") as f:
+                digest.update(f.read())
+        _parserSourceDigest = digest.digest()
+    return _parserSourceDigest
+
+
+def parseBelFile(filename: str, belPrefix: str, syntax: Literal["vhdl", "verilog"], cacheDir: str = None) -> Tuple[List[Tuple[str, IO]], List[Tuple[str, IO]], List[Tuple[str, IO]], List[Tuple[str, IO]], int, bool, Dict[str, Dict]]:
+    """
+    Parse a bel file with `parseFileVHDL` or `parseFileVerilog`. If a cache directory is given, the result is stored in
+    it together with the hash of the file content and of the parser source. There is one entry per bel file, bel prefix
+    and syntax, which is replaced whenever the file or the parser changes, so an unchanged bel file is only parsed once
+    and the results of old file contents do not build up.
+
+    Args:
+        filename (str): The input file name.
+        belPrefix (str): The bel prefix provided by the CSV file.
+        syntax (Literal["vhdl", "verilog"]): The HDL the bel file is written in.
+        cacheDir (str, optional): The directory of the parse cache. Defaults to None, which disables the cache.
+
+    Returns:
+        Tuple[List[Tuple[str, IO]], List[Tuple[str, IO]], List[Tuple[str, IO]], List[Tuple[str, IO]], int, bool, Dict[str, Dict]]:
+        The result of `parseFileVHDL` or `parseFileVerilog`.
+    """
+    parseFile = parseFileVHDL if syntax == "vhdl" else parseFileVerilog
+    if cacheDir is None or not os.path.isfile(filename):
+        return parseFile(filename, belPrefix)
+
+    # the entry is named by the path relative to the cache, so it stays valid when the project is moved
+    entry = f"{os.path.relpath(os.path.abspath(filename), os.path.abspath(cacheDir))}\0{belPrefix}\0{syntax}"
+    cacheFile = os.path.join(cacheDir, f"{hashlib.sha256(entry.encode()).hexdigest()}.pkl")
+    with open(filename, "rb") as f:
+        key = hashlib.sha256(f.read())
+    key.update(_parserDigest())
+    key = key.hexdigest()
+    if os.path.exists(cacheFile):
+        try:
+            with open(cacheFile, "rb") as f:
+                cachedKey, result = pickle.load(f)
+            if cachedKey == key:
+                return result
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, TypeError):
+            pass
+
+    result = parseFile(filename, belPrefix)
+    os.makedirs(cacheDir, exist_ok=True)
+    # write to a temporary file first, so a concurrent parse never reads a partial entry
+    with open(f"{cacheFile}.{os.getpid()}", "wb") as f:
+        pickle.dump((key, result), f)
+    os.replace(f"{cacheFile}.{os.getpid()}", cacheFile)
+    return result
+
+
 def parseFileVHDL(filename: str, belPrefix: str = "") -> Tuple[List[Tuple[str, IO]], List[Tuple[str, IO]], List[Tuple[str, IO]], List[Tuple[str, IO]], int, bool, Dict[str, int]]:
     """
     Parse a VHDL bel file and return all the related information of the bel. The tuple returned for relating to ports will
@@ -787,6 +1016,44 @@ def parseMatrix(fileName: str, tileName: str) -> Dict[str, List[str]]:
     return connectionsDic
 
 
+# switch matrices parsed so far, keyed by the matrix file, its modification time and size and the tile name
+_switchMatrixCache: Dict[Tuple[str, int, int, str], SwitchMatrix] = {}
+
+
+def parseSwitchMatrix(fileName: str, tileName: str) -> SwitchMatrix:
+    """
+    Parse the matrix csv into a `SwitchMatrix`. The result is shared by all callers and the file is only parsed again
+    when it has changed.
+
+    Args:
+        fileName (str): directory of the matrix csv file
+        tileName (str): name of the tile need to be parsed
+
+    Returns:
+        SwitchMatrix: The switch matrix of the file
+    """
+    stat = os.stat(fileName)
+    key = (os.path.abspath(fileName), stat.st_mtime_ns, stat.st_size, tileName)
+    if key not in _switchMatrixCache:
+        _switchMatrixCache[key] = SwitchMatrix(parseMatrix(fileName, tileName))
+    return _switchMatrixCache[key]
+
+
+def getSwitchMatrix(tile: Tile) -> SwitchMatrix:
+    """
+    Returns the switch matrix of the tile from its matrix csv file and caches it on the tile. All tiles of the same
+    type share one `SwitchMatrix` object.
+
+    Args:
+        tile (Tile): A tile object whose matrixDir is a matrix csv file
+
+    Returns:
+        SwitchMatrix: The switch matrix of the tile
+    """
+    tile.switchMatrix = parseSwitchMatrix(tile.matrixDir, tile.name)
+    return tile.switchMatrix
+
+
 def parseConfigMem(fileName: str, maxFramePerCol: int, frameBitPerRow: int, globalConfigBits: int) -> List[ConfigMem]:
     """
     Parse the config memory csv file into a list of ConfigMem objects
@@ -823,23 +1090,29 @@ def parseConfigMem(fileName: str, maxFramePerCol: int, frameBitPerRow: int, glob
                 f"WARNING: the bitstream mapping file has only {len(mappingFile)} entries but MaxFramesPerCol is {maxFramePerCol}")
 
         # we also check used_bits_mask (is a vector that is as long as a frame and contains a '1' for a bit used and a '0' if not used (padded)
-        usedBitsCounter = 0
+        # a mask with too many 1-elements is also too long, so the first mask of the wrong length is the first error
         for entry in mappingFile:
-            if entry["used_bits_mask"].count("1") > frameBitPerRow:
-                raise ValueError(
-                    f"bitstream mapping file {fileName} has to many 1-elements in bitmask for frame : {entry['frame_name']}")
             if len(entry["used_bits_mask"]) != frameBitPerRow:
+                if entry["used_bits_mask"].count("1") > frameBitPerRow:
+                    raise ValueError(
+                        f"bitstream mapping file {fileName} has to many 1-elements in bitmask for frame : {entry['frame_name']}")
                 raise ValueError(
                     f"bitstream mapping file {fileName} has has a too long or short bitmask for frame : {entry['frame_name']}")
-            usedBitsCounter += entry["used_bits_mask"].count("1")
+
+        # all masks have the same length now and are counted as one (frames, frameBitPerRow) array
+        usedBits = numpy.frombuffer("".join(entry["used_bits_mask"] for entry in mappingFile).encode("ascii", "replace"),
+                                    dtype=numpy.uint8).reshape(len(mappingFile), frameBitPerRow) == ord("1")
+        usedBitsPerFrame = usedBits.sum(axis=1).tolist()
+        usedBitsCounter = sum(usedBitsPerFrame)
 
         if usedBitsCounter != globalConfigBits:
             raise ValueError(
                 f"bitstream mapping file {fileName} has a bitmask miss match; bitmask has in total {usedBitsCounter} 1-values for {globalConfigBits} bits")
 
-        allConfigBitsOrder = []
+        # config bits allocated by the previous frames, a frame is only checked against these
+        allConfigBits = set()
         configMemEntry = []
-        for entry in mappingFile:
+        for entry, bitsUsedInFrame in zip(mappingFile, usedBitsPerFrame):
             configBitsOrder = []
             entry["ConfigBits_ranges"] = entry["ConfigBits_ranges"].replace(
                 " ", "").replace("\t", "")
@@ -854,15 +1127,15 @@ def parseConfigMem(fileName: str, maxFramePerCol: int, frameBitPerRow: int, glob
                 else:
                     numList = list(range(left, right + 1))
 
-                for i in numList:
-                    if i in allConfigBitsOrder:
-                        raise ValueError(
-                            f"Configuration bit index {i} already allocated in {fileName}, {entry['frame_name']}")
-                    configBitsOrder.append(i)
+                if not allConfigBits.isdisjoint(numList):
+                    i = next(i for i in numList if i in allConfigBits)
+                    raise ValueError(
+                        f"Configuration bit index {i} already allocated in {fileName}, {entry['frame_name']}")
+                configBitsOrder = numList
 
             elif ";" in entry["ConfigBits_ranges"]:
                 for item in entry["ConfigBits_ranges"].split(";"):
-                    if int(item) in allConfigBitsOrder:
+                    if int(item) in allConfigBits:
                         raise ValueError(
                             f"Configuration bit index {item} already allocated in {fileName}, {entry['frame_name']}")
                     configBitsOrder.append(int(item))
@@ -874,20 +1147,52 @@ def parseConfigMem(fileName: str, maxFramePerCol: int, frameBitPerRow: int, glob
                 raise ValueError(
                     f"Range {entry['ConfigBits_ranges']} is not a valid format. It should be in the form [int]:[int] or [int]. If there are multiple ranges it should be separated by ';'")
 
-            allConfigBitsOrder += configBitsOrder
+            allConfigBits.update(configBitsOrder)
 
-            if entry["used_bits_mask"].count("1") > 0:
+            if bitsUsedInFrame > 0:
                 configMemEntry.append(ConfigMem(frameName=entry["frame_name"],
                                                 frameIndex=int(
                                                     entry["frame_index"]),
-                                                bitsUsedInFrame=entry["used_bits_mask"].count(
-                                                    "1"),
+                                                bitsUsedInFrame=bitsUsedInFrame,
                                                 usedBitMask=entry["used_bits_mask"],
-                                                configBitRanges=configBitsOrder))
+                                                configBitRanges=tuple(configBitsOrder)))
 
     return configMemEntry
 
 
+def configMemEncoding(configMemList: List[ConfigMem], maxFramePerCol: int, frameBitPerRow: int) -> ConfigMemEncoding:
+    """
+    Compute the encoding between the config bits and the frame bits of a config memory. Bit i of a used bit mask
+    (counted from the left) holds the next config bit of the config bit range of its frame.
+
+    Args:
+        configMemList (List[ConfigMem]): The config memory entries from `parseConfigMem`
+        maxFramePerCol (int): maximum number of frames per column
+        frameBitPerRow (int): number of bits per row
+
+    Raises:
+        ValueError: The config bit range of a frame has fewer entries than the used bit mask
+
+    Returns:
+        ConfigMemEncoding: The encoding of the config memory
+    """
+    configBitToFrameBit = numpy.full(maxFramePerCol * frameBitPerRow, -1, dtype=numpy.int64)
+    frameBitToConfigBit = numpy.full(maxFramePerCol * frameBitPerRow, -1, dtype=numpy.int64)
+    for cfm in configMemList:
+        usedBits = numpy.flatnonzero(numpy.frombuffer(cfm.usedBitMask.encode(), dtype=numpy.uint8) == ord("1"))
+        if len(cfm.configBitRanges) < len(usedBits):
+            raise ValueError(
+                f"Frame {cfm.frameName} uses {len(usedBits)} bits but only {len(cfm.configBitRanges)} config bits are assigned to it")
+        configBits = numpy.array(cfm.configBitRanges[:len(usedBits)], dtype=numpy.int64)
+        frameBits = cfm.frameIndex * frameBitPerRow + frameBitPerRow - 1 - usedBits
+        configBitToFrameBit[configBits] = frameBits
+        frameBitToConfigBit[frameBits] = configBits
+
+    return ConfigMemEncoding(configMems=tuple(configMemList),
+                             configBitToFrameBit=tuple(configBitToFrameBit.tolist()),
+                             frameBitToConfigBit=tuple(frameBitToConfigBit.tolist()))
+
+
 if __name__ == '__main__':
     # result = parseFabricCSV('fabric.csv')
     # result1 = parseList('RegFile_switch_matrix.list', collect="source")
@@ -2,7 +2,7 @@ import string
 from typing import Tuple
 from fabric_generator.utilities import *
 from fabric_generator.fabric import Fabric, Tile
-from fabric_generator.file_parser import parseMatrix, parseList
+from fabric_generator.file_parser import getSwitchMatrix, parseList
 
 
 def genNextpnrModel(fabric: Fabric):
@@ -14,6 +14,8 @@ def genNextpnrModel(fabric: Fabric):
     belv2Str.append(
         f"# BEL descriptions: top left corner Tile_X0Y0, bottom right Tile_X{fabric.numberOfColumns}Y{fabric.numberOfRows}")
     constrainStr = []
+    wireDatabase = fabric.getWireDatabase()
+    names = wireDatabase.names
 
     for y, row in enumerate(fabric.tile):
         for x, tile in enumerate(row):
@@ -21,11 +23,9 @@ def genNextpnrModel(fabric: Fabric):
                 continue
             pipStr.append(f"#Tile-internal pips on tile X{x}Y{y}:")
             if tile.matrixDir.endswith(".csv"):
-                connection = parseMatrix(tile.matrixDir, tile.name)
-                for source, sinkList in connection.items():
-                    for sink in sinkList:
-                        pipStr.append(
-                            f"X{x}Y{y},{sink},X{x}Y{y},{source},{8},{sink}.{source}")
+                for source, sink in getSwitchMatrix(tile).getPips():
+                    pipStr.append(
+                        f"X{x}Y{y},{sink},X{x}Y{y},{source},{8},{sink}.{source}")
             elif tile.matrixDir.endswith(".list"):
                 connection = parseList(tile.matrixDir)
                 for sink, source in connection:
@@ -36,9 +36,12 @@ def genNextpnrModel(fabric: Fabric):
                     f"For model generation {tile.matrixDir} need to a csv or list file")
 
             pipStr.append(f"#Tile-external pips on tile X{x}Y{y}:")
-            for wire in tile.wireList:
+            wires = wireDatabase.getTileWires(x, y)
+            for source, destination, destX, destY in zip(wires.source.tolist(), wires.destination.tolist(),
+                                                         wires.destinationX.tolist(), wires.destinationY.tolist()):
+                source, destination = names[source], names[destination]
                 pipStr.append(
-                    f"X{x}Y{y},{wire.source},X{x+wire.xOffset}Y{y+wire.yOffset},{wire.destination},{8},{wire.source}.{wire.destination}")
+                    f"X{x}Y{y},{source},X{destX}Y{destY},{destination},{8},{source}.{destination}")
 
             # Old style bel definition
             belStr.append(f"#Tile_X{x}Y{y}")
@@ -5,9 +5,10 @@ from fabric_generator.fabric_gen import FabricGenerator
 from fabric_generator.utilities import *
 from fabric_generator.fabric import IO, Bel, Fabric
 import xml.etree.ElementTree as ET
+import numpy
 import os
 from xml.dom import minidom
-from fabric_generator.file_parser import parseMatrix, parseList
+from fabric_generator.file_parser import getSwitchMatrix, parseList
 import logging
 logger = logging.getLogger(__name__)
 
@@ -377,6 +378,8 @@ def genVPRRoutingResourceGraph(fabric: Fabric) -> (str, int):
     curNodeId += 1
     clockPtc += 1
 
+    wireDatabase = fabric.getWireDatabase()
+    names = wireDatabase.names
     for y, row in enumerate(fabric.tile):
         for x, tile in enumerate(row):
             if tile == None:
@@ -399,36 +402,38 @@ def genVPRRoutingResourceGraph(fabric: Fabric) -> (str, int):
 
             nodeType = ""
             doneWire = set()
-            for wire in tile.wireList:
-                if wire.xOffset != 0 and wire.yOffset != 0:
-                    raise ValueError(
-                        "Diagonal wires not currently supported for VPR routing resource model")
-                if (wire.source, wire.destination) in doneWire:
+            wires = wireDatabase.getTileWires(x, y)
+            if numpy.any((wires.xOffset != 0) & (wires.yOffset != 0)):
+                raise ValueError(
+                    "Diagonal wires not currently supported for VPR routing resource model")
+            for source, destination, xOffset, yOffset in zip(wires.source.tolist(), wires.destination.tolist(),
+                                                             wires.xOffset.tolist(), wires.yOffset.tolist()):
+                if (source, destination) in doneWire:
                     continue
-                doneWire.add((wire.source, wire.destination))
-                if wire.yOffset != 0:
+                doneWire.add((source, destination))
+                if yOffset != 0:
                     nodeType = "CHANY"
-                elif wire.xOffset != 0:
+                elif xOffset != 0:
                     nodeType = "CHANX"
                 else:
                     nodeType = "CHANY"
 
                 # Check wire direction and set appropriate values
-                if (nodeType == "CHANX" and wire.xOffset > 0) or (nodeType == "CHANY" and wire.yOffset > 0):
+                if (nodeType == "CHANX" and xOffset > 0) or (nodeType == "CHANY" and yOffset > 0):
                     direction = "INC_DIR"
                     yLow = y
                     xLow = x
-                    yHigh = y + wire.yOffset
-                    xHigh = x + wire.xOffset
+                    yHigh = y + yOffset
+                    xHigh = x + xOffset
                 else:
                     direction = "DEC_DIR"
                     yHigh = y
                     xHigh = x
-                    yLow = y + wire.yOffset
-                    xLow = x + wire.xOffset
+                    yLow = y + yOffset
+                    xLow = x + xOffset
 
-                wireSource = f"X{x}Y{y}.{wire.source}"
-                wireDest = f"X{x + wire.xOffset}Y{y + wire.yOffset}.{wire.destination}"
+                wireSource = f"X{x}Y{y}.{names[source]}"
+                wireDest = f"X{x + xOffset}Y{y + yOffset}.{names[destination]}"
 
                 if nodeType == "CHANY":
                     wirePtc = colPtcArr[x]
@@ -542,7 +547,7 @@ def genVPRRoutingResourceGraph(fabric: Fabric) -> (str, int):
                           sink_node=f"{sourceToWireIDMap[f'X{clockX}Y{clockY}.UserCLK']}", switch_id="1")
 
             if tile.matrixDir.endswith(".csv"):
-                connections = parseMatrix(tile.matrixDir, tile.name)
+                connections = getSwitchMatrix(tile).getConnections()
             elif tile.matrixDir.endswith(".list"):
                 logger.info(f"TileX{x}Y{y}_{tile.name} matrix is a list file")
                 logger.info(
@@ -553,7 +558,7 @@ def genVPRRoutingResourceGraph(fabric: Fabric) -> (str, int):
                 logger.info(
                     f"Update matrix directory to {matrixDir} for Fabric TileX{x}Y{y}_{tile.name}")
                 tile.matrixDir = matrixDir
-                connections = parseMatrix(tile.matrixDir, tile.name)
+                connections = getSwitchMatrix(tile).getConnections()
             else:
                 raise ValueError(
                     f"For model generation {tile.matrixDir} need to a csv or list file")
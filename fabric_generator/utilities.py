@@ -1,4 +1,5 @@
 import re
+import multiprocessing
 
 # Default parameters (will be overwritten if defined in fabric between 'ParametersBegin' and 'ParametersEnd'
 #Parameters = [ 'ConfigBitMode', 'FrameBitsPerRow' ]
@@ -538,6 +539,13 @@ def GetVerilogDeclarationForFile(VHDL_file_name):
     return ConfigPortUsed
 
 
+def processPoolContext():
+    # forked workers start without importing the generator again
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
 # This class represents individual tiles in the architecture
 class TileModelGen:
     tileType = ""
@@ -575,35 +583,40 @@ class FabricModelGen:
     def __init__(self, inHeight, inWidth):
         self.width = inWidth
         self.height = inHeight
+        # (location, destination) -> first (tile, wire, index) ending there, with and without JUMP wires,
+        # built by buildWireDestIndex once genFabricObject has added all the wires
+        self.wireDestIndex = {True: {}, False: {}}
 
     def getTileByCoords(self, x: int, y: int):
-        for row in self.tiles:
-            for tile in row:
-                if tile.x == x and tile.y == y:
-                    return tile
-        # raise ValueError(f"{x}, {y} is not a valid tile coordinate")
+        # tiles[y][x] is the tile at (x, y)
+        if 0 <= y < len(self.tiles) and 0 <= x < len(self.tiles[y]):
+            return self.tiles[y][x]
+        return None
 
     def getTileByLoc(self, loc: str):
-        for row in self.tiles:
-            for tile in row:
-                if tile.genTileLoc() == loc:
-                    return tile
-        return None
+        m = re.fullmatch(r"X(\d+)Y(\d+)", loc)
+        if m is None:
+            return None
+        return self.getTileByCoords(int(m.group(1)), int(m.group(2)))
+
+    def buildWireDestIndex(self):
+        for jumps in (True, False):
+            index = {}
+            for row in self.tiles:
+                for tile in row:
+                    for wire in tile.wires:
+                        if not jumps:
+                            if wire["direction"] == "JUMP":
+                                continue
+                        for i in range(int(wire["wire-count"])):
+                            desty = tile.y + int(wire["yoffset"])
+                            destx = tile.x + int(wire["xoffset"])
+                            desttileLoc = f"X{destx}Y{desty}"
+                            index.setdefault((desttileLoc, wire["destination"] + str(i)), (tile, wire, i))
+            self.wireDestIndex[jumps] = index
 
     def getTileAndWireByWireDest(self, loc: str, dest: str, jumps: bool = True):
-        for row in self.tiles:
-            for tile in row:
-                for wire in tile.wires:
-                    if not jumps:
-                        if wire["direction"] == "JUMP":
-                            continue
-                    for i in range(int(wire["wire-count"])):
-                        desty = tile.y + int(wire["yoffset"])
-                        destx = tile.x + int(wire["xoffset"])
-                        desttileLoc = f"X{destx}Y{desty}"
-                        if (desttileLoc == loc) and (wire["destination"] + str(i) == dest):
-                            return (tile, wire, i)
-        return None
+        return self.wireDestIndex[jumps].get((loc, dest))
 
 
 # Method to add square brackets for wire pair generation (to account for different reference styles)
@@ -1032,6 +1045,7 @@ def genFabricObject(fabric: list, FabricFile):
             tile.wires.extend(wires)
             tile.atomicWires = tempAtomicWires
 
+    archFabric.buildWireDestIndex()
     archFabric.cellTypes = GetCellTypes(fabric)
 
     return archFabric
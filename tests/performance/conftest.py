@@ -0,0 +1,32 @@
+import os
+import shutil
+
+import pytest
+
+from fabric_generator.fabric import Fabric
+from fabric_generator.file_parser import parseFabricCSV
+from tests.performance.synth import synthFabricCSV
+
+TEMPLATE_PROJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "fabric_files",
+                                "FABulous_project_template_verilog")
+
+
+@pytest.fixture(scope="session")
+def templateProject(tmp_path_factory) -> str:
+    """A copy of the Verilog project template, so that parsing never writes into the repository."""
+    project = str(tmp_path_factory.mktemp("fabric") / "project")
+    shutil.copytree(TEMPLATE_PROJECT, project, ignore=shutil.ignore_patterns(".FABulous"))
+    return project
+
+
+@pytest.fixture(scope="session")
+def templateFabric(templateProject) -> Fabric:
+    return parseFabricCSV(os.path.join(templateProject, "fabric.csv"), 1)
+
+
+@pytest.fixture(scope="session")
+def syntheticFabric(templateProject) -> Fabric:
+    """The template fabric grown to 32x32 tiles by repeating its inner rows and columns."""
+    fileName = os.path.join(templateProject, "fabric_32x32.csv")
+    synthFabricCSV(os.path.join(templateProject, "fabric.csv"), fileName, 32, 32)
+    return parseFabricCSV(fileName, 1)
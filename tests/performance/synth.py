@@ -0,0 +1,75 @@
+"""
+Synthetic inputs for the performance tests and the benchmarks: fabrics built by repeating the inner rows and columns
+of a project's fabric.csv and config memory csv files of any size.
+"""
+import csv
+import random
+from typing import List
+
+
+def synthFabricCSV(fileName: str, outFile: str, rows: int, columns: int) -> None:
+    """
+    Write a copy of the csv file whose fabric has the given size. The first and last row and column of the fabric are
+    kept as the border and the inner rows and columns are repeated to fill the rest.
+
+    Args:
+        fileName (str): The csv file of the fabric to grow
+        outFile (str): The csv file to write
+        rows (int): The number of rows of the synthetic fabric
+        columns (int): The number of columns of the synthetic fabric
+    """
+    with open(fileName) as f:
+        lines = list(csv.reader(f))
+    begin = next(i for i, line in enumerate(lines) if line and line[0] == "FabricBegin")
+    end = next(i for i, line in enumerate(lines) if line and line[0] == "FabricEnd")
+    fabric: List[List[str]] = []
+    for line in lines[begin+1:end]:
+        if "#" in line:
+            line = line[:line.index("#")]
+        while line and line[-1] == "":
+            line = line[:-1]
+        fabric.append(line)
+
+    inner = fabric[1:-1]
+    rowList = [fabric[0]] + [inner[i % len(inner)] for i in range(rows-2)] + [fabric[-1]]
+    grid = []
+    for line in rowList:
+        innerColumns = line[1:-1]
+        grid.append([line[0]] + [innerColumns[i % len(innerColumns)] for i in range(columns-2)] + [line[-1]])
+
+    with open(outFile, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerows(lines[:begin+1])
+        writer.writerows(grid)
+        writer.writerows(lines[end:])
+
+
+def synthConfigMemCSV(fileName: str, frames: int, frameBitsPerRow: int) -> int:
+    """
+    Write a config memory csv file whose frames are all fully used. The config bits of the frames are given in turn
+    as an ascending range, a descending range and a shuffled list.
+
+    Args:
+        fileName (str): The csv file to write
+        frames (int): The number of frames
+        frameBitsPerRow (int): The number of bits of each frame
+
+    Returns:
+        int: The number of config bits, frames * frameBitsPerRow
+    """
+    shuffle = random.Random(0).shuffle
+    with open(fileName, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame_name", "frame_index", "bits_used_in_frame", "used_bits_mask", "ConfigBits_ranges"])
+        for frame in range(frames):
+            first, last = frame * frameBitsPerRow, (frame+1) * frameBitsPerRow - 1
+            if frame % 3 == 0:
+                bits = f"{first}:{last}"
+            elif frame % 3 == 1:
+                bits = f"{last}:{first}"
+            else:
+                bitList = list(range(first, last + 1))
+                shuffle(bitList)
+                bits = ";".join(str(i) for i in bitList)
+            writer.writerow([f"Frame{frame}", frame, frameBitsPerRow, "1" * frameBitsPerRow, bits])
+    return frames * frameBitsPerRow
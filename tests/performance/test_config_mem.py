@@ -0,0 +1,162 @@
+import csv
+import os
+import re
+import time
+
+import pytest
+
+from fabric_generator.file_parser import parseConfigMem
+from tests.performance.synth import synthConfigMemCSV
+
+
+def oldParseConfigMem(fileName: str, maxFramePerCol: int, frameBitPerRow: int, globalConfigBits: int):
+    # parseConfigMem before the config bits were checked against a set, with the entries as plain tuples
+    with open(fileName) as f:
+        mappingFile = list(csv.DictReader(f))
+
+        for i, _ in enumerate(mappingFile):
+            mappingFile[i]["used_bits_mask"] = mappingFile[i]["used_bits_mask"].replace("_", "")
+
+        if len(mappingFile) != maxFramePerCol:
+            raise ValueError(
+                f"WARNING: the bitstream mapping file has only {len(mappingFile)} entries but MaxFramesPerCol is {maxFramePerCol}")
+
+        usedBitsCounter = 0
+        for entry in mappingFile:
+            if entry["used_bits_mask"].count("1") > frameBitPerRow:
+                raise ValueError(
+                    f"bitstream mapping file {fileName} has to many 1-elements in bitmask for frame : {entry['frame_name']}")
+            if len(entry["used_bits_mask"]) != frameBitPerRow:
+                raise ValueError(
+                    f"bitstream mapping file {fileName} has has a too long or short bitmask for frame : {entry['frame_name']}")
+            usedBitsCounter += entry["used_bits_mask"].count("1")
+
+        if usedBitsCounter != globalConfigBits:
+            raise ValueError(
+                f"bitstream mapping file {fileName} has a bitmask miss match; bitmask has in total {usedBitsCounter} 1-values for {globalConfigBits} bits")
+
+        allConfigBitsOrder = []
+        configMemEntry = []
+        for entry in mappingFile:
+            configBitsOrder = []
+            entry["ConfigBits_ranges"] = entry["ConfigBits_ranges"].replace(" ", "").replace("\t", "")
+
+            if ":" in entry["ConfigBits_ranges"]:
+                left, right = re.split(':', entry["ConfigBits_ranges"])
+                left, right = int(left), int(right)
+                if right < left:
+                    left, right = right, left
+                    numList = list(reversed(range(left, right + 1)))
+                else:
+                    numList = list(range(left, right + 1))
+
+                for i in numList:
+                    if i in allConfigBitsOrder:
+                        raise ValueError(
+                            f"Configuration bit index {i} already allocated in {fileName}, {entry['frame_name']}")
+                    configBitsOrder.append(i)
+
+            elif ";" in entry["ConfigBits_ranges"]:
+                for item in entry["ConfigBits_ranges"].split(";"):
+                    if int(item) in allConfigBitsOrder:
+                        raise ValueError(
+                            f"Configuration bit index {item} already allocated in {fileName}, {entry['frame_name']}")
+                    configBitsOrder.append(int(item))
+
+            elif "NULL" in entry["ConfigBits_ranges"]:
+                continue
+
+            else:
+                raise ValueError(
+                    f"Range {entry['ConfigBits_ranges']} is not a valid format. It should be in the form [int]:[int] or [int]. If there are multiple ranges it should be separated by ';'")
+
+            allConfigBitsOrder += configBitsOrder
+
+            if entry["used_bits_mask"].count("1") > 0:
+                configMemEntry.append((entry["frame_name"], int(entry["frame_index"]),
+                                       entry["used_bits_mask"].count("1"), entry["used_bits_mask"], configBitsOrder))
+
+    return configMemEntry
+
+
+def asTuples(configMems):
+    return [(i.frameName, i.frameIndex, i.bitsUsedInFrame, i.usedBitMask, list(i.configBitRanges)) for i in configMems]
+
+
+def editRows(fileName: str, outFile: str, edit) -> None:
+    with open(fileName) as f:
+        rows = list(csv.DictReader(f))
+    edit(rows)
+    with open(outFile, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def configMemFile(tmp_path) -> str:
+    # 4 frames of 8 bits, the config bits given as an ascending range, a descending range and a list
+    fileName = str(tmp_path / "ConfigMem.csv")
+    synthConfigMemCSV(fileName, 4, 8)
+    return fileName
+
+
+def test_template_config_mem_matches_old_implementation(templateProject, templateFabric):
+    fileName = os.path.join(templateProject, "Tile", "LUT4AB", "LUT4AB_ConfigMem.csv")
+    args = (templateFabric.maxFramesPerCol, templateFabric.frameBitsPerRow,
+            templateFabric.tileDic["LUT4AB"].globalConfigBits)
+    assert asTuples(parseConfigMem(fileName, *args)) == oldParseConfigMem(fileName, *args)
+
+
+def test_synthetic_config_mem_matches_old_implementation(configMemFile):
+    assert asTuples(parseConfigMem(configMemFile, 4, 8, 32)) == oldParseConfigMem(configMemFile, 4, 8, 32)
+
+
+def setRow(row: int, column: str, value: str):
+    def edit(rows):
+        rows[row][column] = value
+    return edit
+
+
+@pytest.mark.parametrize("edit, args", [
+    # a bit of an earlier frame given again as a range and in a list
+    (setRow(1, "ConfigBits_ranges", "3:10"), (4, 8, 32)),
+    (setRow(2, "ConfigBits_ranges", "16;17;18;19;20;21;22;7"), (4, 8, 32)),
+    # a mask with too many 1-elements, a mask of the wrong length and masks with the wrong number of 1-elements
+    (setRow(2, "used_bits_mask", "1" * 9), (4, 8, 32)),
+    (setRow(2, "used_bits_mask", "1" * 7), (4, 8, 32)),
+    (setRow(3, "used_bits_mask", "1111_0111"), (4, 8, 32)),
+    (None, (4, 8, 33)),
+    # the wrong number of frames and a range in an invalid format
+    (None, (5, 8, 32)),
+    (setRow(3, "ConfigBits_ranges", "24-31"), (4, 8, 32)),
+])
+def test_errors_match_old_implementation(configMemFile, tmp_path, edit, args):
+    fileName = configMemFile
+    if edit is not None:
+        fileName = str(tmp_path / "Edited_ConfigMem.csv")
+        editRows(configMemFile, fileName, edit)
+    with pytest.raises(ValueError) as old:
+        oldParseConfigMem(fileName, *args)
+    with pytest.raises(ValueError) as new:
+        parseConfigMem(fileName, *args)
+    assert str(new.value) == str(old.value)
+
+
+@pytest.mark.perf
+def test_parse_config_mem_10k_bits(tmp_path):
+    fileName = str(tmp_path / "ConfigMem.csv")
+    # 320 frames of 32 bits, 10240 config bits
+    configBits = synthConfigMemCSV(fileName, 320, 32)
+
+    start = time.perf_counter()
+    configMems = parseConfigMem(fileName, 320, 32, configBits)
+    newTime = time.perf_counter() - start
+    start = time.perf_counter()
+    oldConfigMems = oldParseConfigMem(fileName, 320, 32, configBits)
+    oldTime = time.perf_counter() - start
+    print(f"\nparseConfigMem {configBits} bits: {newTime:.3f}s, {oldTime:.3f}s before")
+
+    assert asTuples(configMems) == oldConfigMems
+    # the old check of each bit against the list of all earlier bits is quadratic
+    assert newTime * 10 < oldTime
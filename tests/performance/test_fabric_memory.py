@@ -0,0 +1,109 @@
+import copy
+import gc
+import os
+import pickle
+import tracemalloc
+from dataclasses import fields
+
+import pytest
+
+from fabric_generator.fabric import ConfigMem, ConfigMemEncoding, Fabric, Port, Tile, Wire
+from fabric_generator.file_parser import configMemEncoding, loadFabricCSV, parseConfigMem
+from tests.performance.synth import synthFabricCSV
+
+
+def placedTiles(fabric: Fabric):
+    return [tile for row in fabric.tile for tile in row if tile is not None]
+
+
+@pytest.fixture(params=["templateFabric", "syntheticFabric"])
+def fabric(request) -> Fabric:
+    return request.getfixturevalue(request.param)
+
+
+@pytest.fixture(scope="module")
+def encoding(templateProject, templateFabric) -> ConfigMemEncoding:
+    tile = templateFabric.tileDic["LUT4AB"]
+    configMems = parseConfigMem(os.path.join(templateProject, "Tile", "LUT4AB", "LUT4AB_ConfigMem.csv"),
+                                templateFabric.maxFramesPerCol, templateFabric.frameBitsPerRow,
+                                tile.globalConfigBits)
+    return configMemEncoding(configMems, templateFabric.maxFramesPerCol, templateFabric.frameBitsPerRow)
+
+
+def test_ports_and_wires_are_shared_by_the_tiles_of_a_type(fabric: Fabric):
+    for tile in placedTiles(fabric):
+        template = fabric.tileDic[tile.name]
+        assert tile is not template
+        assert tile.wireList is template.wireList
+        assert len(tile.portsInfo) == len(template.portsInfo)
+        assert all(port is other for port, other in zip(tile.portsInfo, template.portsInfo))
+
+
+def test_bels_are_copied_for_each_tile(templateFabric: Fabric):
+    tiles = [tile for tile in placedTiles(templateFabric) if tile.name == "LUT4AB"]
+    assert len(tiles) > 1
+    assert all(bel is not other for bel, other in zip(tiles[0].bels, tiles[1].bels))
+    for bel in tiles[0].bels:
+        assert copy.deepcopy(bel) is not bel
+        assert copy.deepcopy(bel) == bel
+
+
+def test_instances_have_no_dict(templateFabric: Fabric, encoding: ConfigMemEncoding):
+    tile = templateFabric.tileDic["LUT4AB"]
+    for obj in [tile, tile.portsInfo[0], tile.wireList[0], tile.bels[0], encoding, encoding.configMems[0]]:
+        assert not hasattr(obj, "__dict__"), type(obj).__name__
+
+
+def assertSameSlots(obj, restored):
+    assert type(restored) is type(obj)
+    for field in fields(obj):
+        assert getattr(restored, field.name) == getattr(obj, field.name), f"{type(obj).__name__}.{field.name}"
+
+
+def test_pickle_round_trip(templateFabric: Fabric, encoding: ConfigMemEncoding):
+    tile = templateFabric.tileDic["LUT4AB"]
+    objects = [*tile.portsInfo, *tile.wireList, *tile.bels, encoding, *encoding.configMems]
+    for obj in objects:
+        restored = pickle.loads(pickle.dumps(obj))
+        assertSameSlots(obj, restored)
+        assert restored == obj
+
+    # the ports are still shared after the round trip of a whole fabric
+    restoredFabric = pickle.loads(pickle.dumps(templateFabric))
+    for tile, restoredTile in zip(placedTiles(templateFabric), placedTiles(restoredFabric)):
+        assert isinstance(restoredTile, Tile)
+        assertSameSlots(tile, restoredTile)
+        restoredTemplate = restoredFabric.tileDic[restoredTile.name]
+        assert restoredTile.wireList is restoredTemplate.wireList
+        assert all(port is other for port, other in zip(restoredTile.portsInfo, restoredTemplate.portsInfo))
+
+
+def test_immutable_instances_are_not_copied(templateFabric: Fabric, encoding: ConfigMemEncoding):
+    tile = templateFabric.tileDic["LUT4AB"]
+    for obj in [tile.portsInfo[0], tile.wireList[0], encoding, encoding.configMems[0]]:
+        assert isinstance(obj, (Port, Wire, ConfigMem, ConfigMemEncoding))
+        assert copy.copy(obj) is obj
+        assert copy.deepcopy(obj) is obj
+        hash(obj)
+
+
+@pytest.mark.perf
+def test_load_64x64_fabric_memory(templateProject):
+    fileName = os.path.join(templateProject, "fabric_64x64.csv")
+    synthFabricCSV(os.path.join(templateProject, "fabric.csv"), fileName, 64, 64)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        fabric = loadFabricCSV(fileName, 1)
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    retained = (after - before) / 2**20
+    print(f"\nloadFabricCSV 64x64: {retained:.1f} MB retained, {peak / 2**20:.1f} MB peak")
+
+    # about 222 MB with the shared ports and wires and the __slots__ classes, 341 MB before
+    assert fabric.numberOfRows == fabric.numberOfColumns == 64
+    assert retained < 280